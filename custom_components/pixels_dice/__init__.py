@@ -2,15 +2,50 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .sensor import PixelsDiceDevice
+from .const import (
+    CONF_DICE,
+    CONF_FACE_ACTIONS,
+    CONF_HUB,
+    CONF_IDENTITY,
+    CONF_PUSH_TARGETS,
+    CONF_TELEMETRY,
+    DATA_HUBS,
+    DOMAIN,
+)
+from .face_actions import FaceActionEngine, parse_face_actions
+from .hub import PixelsDiceHub
+from .identity import DieIdentity
+from .latency import async_setup_latency_tracing
+from .push import RollPushSink, parse_push_targets
+from .sensor import PixelsDiceDevice, async_shutdown_dice
+from .services import async_setup_services
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "button", "switch"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up services, the WebSocket API, latency tracing and shutdown."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    async_setup_latency_tracing(hass)
+
+    async def _async_shutdown(event: Event) -> None:
+        # Entries are not unloaded on shutdown; close every link at once
+        await async_shutdown_dice(list(hass.data.get(DOMAIN, {}).values()))
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Pixels Dice from a config entry."""
@@ -18,30 +53,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
+    if entry.data.get(CONF_HUB):
+        return await async_setup_hub_entry(hass, entry)
+
     pixels_device = PixelsDiceDevice(
         hass,
         entry.data["name"],
         entry.unique_id,
         entry.data.get("autoconnect", False),
+        (
+            DieIdentity.from_dict(entry.data[CONF_IDENTITY])
+            if CONF_IDENTITY in entry.data
+            else None
+        ),
+        entry.options.get(CONF_TELEMETRY, False),
     )
     hass.data[DOMAIN][entry.unique_id] = pixels_device
 
     await pixels_device.async_added_to_hass()
+    pixels_device.statistics.async_start()
+
+    if push_targets := entry.options.get(CONF_PUSH_TARGETS):
+        push_sink = RollPushSink(hass, pixels_device, parse_push_targets(push_targets))
+        await push_sink.async_start()
+        entry.async_on_unload(push_sink.async_stop)
+
+    if face_actions := entry.options.get(CONF_FACE_ACTIONS):
+        engine = FaceActionEngine(hass, parse_face_actions(face_actions))
+        engine.async_attach(pixels_device)
+        entry.async_on_unload(engine.async_stop)
+
+    options = dict(entry.options)
+
+    async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        # Data updates (the cached die identity) do not need a reload
+        if entry.options != options:
+            await hass.config_entries.async_reload(entry.entry_id)
+
+    entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
+
+async def async_setup_hub_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a hub entry managing many dice."""
+    hub = PixelsDiceHub(hass, entry)
+    hass.data.setdefault(DATA_HUBS, {})[entry.entry_id] = hub
+    await hub.async_setup()
+
+    options = dict(entry.options)
+
+    async def _async_hub_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        # Adding or removing dice is applied in place; other options reload
+        if {**entry.options, CONF_DICE: None} != {**options, CONF_DICE: None}:
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
+        options[CONF_DICE] = entry.options.get(CONF_DICE, [])
+        await hub.async_update_dice(options[CONF_DICE])
+
+    entry.async_on_unload(entry.add_update_listener(_async_hub_updated))
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading Pixels Dice integration")
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload_ok:
-        pixels_device = hass.data[DOMAIN].get(entry.unique_id)
+    if unload_ok and entry.data.get(CONF_HUB):
+        hub = hass.data[DATA_HUBS].pop(entry.entry_id)
+        await hub.async_unload()
+    elif unload_ok:
+        pixels_device = hass.data[DOMAIN].pop(entry.unique_id, None)
         if pixels_device:
-            await pixels_device.async_will_remove_from_hass()
-            hass.data[DOMAIN].pop(entry.unique_id, None)
+            await async_shutdown_dice([pixels_device])
 
     return unload_ok
 
@@ -0,0 +1,71 @@
+"""Deduplication of die advertisements relayed by several Bluetooth proxies.
+
+With more than one scanner or proxy in range, the same advertisement reaches
+the integration once per source. Copies seen within ``DEDUPE_WINDOW`` seconds
+of the first are suppressed: they may only improve the best RSSI, and do not
+refresh presence or notify entities again.
+"""
+from __future__ import annotations
+
+import time
+
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+
+# Seconds during which an identical payload counts as the same advertisement
+DEDUPE_WINDOW = 1.0
+
+type AdvertisementKey = tuple[
+    tuple[tuple[int, bytes], ...], tuple[tuple[str, bytes], ...]
+]
+
+
+class _SeenAdvertisement:
+    """First sighting of a payload and the strongest copy of it."""
+
+    __slots__ = ("rssi", "seen", "source")
+
+    def __init__(self, seen: float, source: str, rssi: int) -> None:
+        self.seen = seen
+        self.source = source
+        self.rssi = rssi
+
+
+class AdvertisementDeduplicator:
+    """Short-window cache of advertisement payloads and their sources."""
+
+    def __init__(self, window: float = DEDUPE_WINDOW) -> None:
+        self._window = window
+        self._seen: dict[AdvertisementKey, _SeenAdvertisement] = {}
+        self.suppressed = 0
+        self.best_source: str | None = None
+
+    def accept(self, service_info: BluetoothServiceInfoBleak) -> tuple[bool, int]:
+        """Return whether the advertisement is new, and the best RSSI for it.
+
+        A duplicate whose RSSI beats the earlier copies makes its source the
+        best source, but is still reported as not new.
+        """
+        now = time.monotonic()
+        key = (
+            tuple(sorted(service_info.manufacturer_data.items())),
+            tuple(sorted(service_info.service_data.items())),
+        )
+        rssi = service_info.rssi
+        seen = self._seen.get(key)
+        if seen is not None and now - seen.seen < self._window:
+            self.suppressed += 1
+            if rssi > seen.rssi:
+                seen.rssi = rssi
+                seen.source = service_info.source
+                self.best_source = seen.source
+            return False, seen.rssi
+
+        # Drop expired payloads; only a handful are ever live at once
+        self._seen = {
+            seen_key: entry
+            for seen_key, entry in self._seen.items()
+            if now - entry.seen < self._window
+        }
+        self._seen[key] = _SeenAdvertisement(now, service_info.source, rssi)
+        self.best_source = service_info.source
+        return True, rssi
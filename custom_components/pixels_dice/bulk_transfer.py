@@ -0,0 +1,298 @@
+"""Chunked bulk data transfer to Pixels Dice.
+
+Pixels dice receive large payloads (profiles, animation data sets) with the
+bulk protocol from DieMessages.ts. A transfer request such as
+``transferAnimationSet`` describes the data and is acknowledged with whether
+the die accepts it. Then a ``bulkSetup`` message announces the size,
+acknowledged with ``bulkSetupAck``, and ``bulkData`` chunks follow, tagged
+with their offset, each acknowledged with a ``bulkDataAck`` echoing the
+offset. The die reports that it has stored the data with the request's
+``...Finished`` message.
+
+Chunks are sized to the negotiated ATT MTU and written without response. Up to
+``window`` chunks are in flight at once, so the link stays busy while earlier
+chunks are being acknowledged, and the die's acks throttle the sender.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+BULK_SETUP = 0x05  # bulkSetup
+BULK_SETUP_ACK = 0x06  # bulkSetupAck
+BULK_DATA = 0x07  # bulkData
+BULK_DATA_ACK = 0x08  # bulkDataAck
+TRANSFER_ANIMATION_SET = 0x09  # transferAnimationSet
+TRANSFER_SETTINGS = 0x0C  # transferSettings
+
+# Transfer request -> (its ack, the message sent once the data is stored)
+TRANSFER_REQUESTS = {
+    # transferAnimationSetAck, transferAnimationSetFinished
+    TRANSFER_ANIMATION_SET: (0x0A, 0x0B),
+    # transferSettingsAck, transferSettingsFinished
+    TRANSFER_SETTINGS: (0x0D, 0x0E),
+}
+
+# transferAnimationSet: palette size, RGB keyframe, RGB track, keyframe and
+# track counts, animation count and size, condition count and size, action
+# count and size, rule count, brightness
+TRANSFER_ANIMATION_SET_FORMAT = struct.Struct("<B12HB")
+# Record sizes of an animation data set in the firmware
+KEYFRAME_SIZE = 2
+TRACK_SIZE = 8
+OFFSET_SIZE = 2
+RULE_SIZE = 4
+
+BULK_SETUP_FORMAT = struct.Struct("<BH")
+BULK_DATA_HEADER = struct.Struct("<BBH")
+BULK_DATA_ACK_FORMAT = struct.Struct("<BH")
+
+# Largest payload the bulk protocol can describe (16-bit size and offsets)
+MAX_BULK_SIZE = 0xFFFF
+# Largest chunk the die's bulkData message holds
+MAX_CHUNK_SIZE = 100
+# ATT header bytes taken out of every write
+ATT_HEADER_SIZE = 3
+# ATT MTU every BLE link supports
+DEFAULT_MTU = 23
+
+DEFAULT_WINDOW = 4
+DEFAULT_ACK_TIMEOUT = 2.0
+
+# Dice transferring at the same time through one adapter or proxy
+MAX_PARALLEL_TRANSFERS = 3
+DATA_TRANSFER_SLOTS = f"{DOMAIN}_transfer_slots"
+
+type ProgressCallback = Callable[[int, int, float], None]
+
+
+def chunk_size_for_mtu(mtu: int | None) -> int:
+    """Return the bulk chunk size that fits in one write at ``mtu``."""
+    usable = (mtu or DEFAULT_MTU) - ATT_HEADER_SIZE - BULK_DATA_HEADER.size
+    return max(1, min(MAX_CHUNK_SIZE, usable))
+
+
+def compute_data_set_hash(data: bytes) -> int:
+    """Return the hash the firmware reports for a data set.
+
+    This is Utils::computeHash in the firmware (djb2, xor variant).
+    """
+    value = 5381
+    for byte in data:
+        value = ((value * 33) ^ byte) & 0xFFFFFFFF
+    return value
+
+
+def _align4(size: int) -> int:
+    """Round ``size`` up to the 4-byte alignment of data set sections."""
+    return (size + 3) & ~3
+
+
+def split_profile(profile: bytes) -> tuple[bytes, bytes]:
+    """Split a profile into its transferAnimationSet message and data set.
+
+    A profile holds the fields of transferAnimationSet (without the message
+    type) followed by the data set they describe. Raises ValueError if the
+    fields do not describe exactly the data that follows.
+    """
+    header_size = TRANSFER_ANIMATION_SET_FORMAT.size - 1
+    if len(profile) <= header_size:
+        raise ValueError("Profile is too short")
+    request = bytes([TRANSFER_ANIMATION_SET]) + profile[:header_size]
+    (
+        _,
+        palette_size,
+        rgb_keyframes,
+        rgb_tracks,
+        keyframes,
+        tracks,
+        animations,
+        animation_size,
+        conditions,
+        condition_size,
+        actions,
+        action_size,
+        rules,
+        _brightness,
+    ) = TRANSFER_ANIMATION_SET_FORMAT.unpack(request)
+    # Every section is 4-byte aligned, as in DataSet::computeDataSetDataSize
+    expected = sum(
+        _align4(size)
+        for size in (
+            palette_size,
+            rgb_keyframes * KEYFRAME_SIZE,
+            rgb_tracks * TRACK_SIZE,
+            keyframes * KEYFRAME_SIZE,
+            tracks * TRACK_SIZE,
+            animations * OFFSET_SIZE,
+            animation_size,
+            conditions * OFFSET_SIZE,
+            condition_size,
+            actions * OFFSET_SIZE,
+            action_size,
+            rules * RULE_SIZE,
+        )
+    )
+    data = profile[header_size:]
+    if len(data) != expected:
+        raise ValueError(
+            f"Profile header describes {expected} bytes of data, found {len(data)}"
+        )
+    return request, data
+
+
+def async_get_transfer_slots(
+    hass: HomeAssistant, source: str | None
+) -> asyncio.Semaphore:
+    """Return the semaphore limiting parallel transfers through ``source``.
+
+    ``source`` is the adapter or proxy the die is reached through, or None if
+    it is not known yet.
+    """
+    slots: dict[str | None, asyncio.Semaphore] = hass.data.setdefault(
+        DATA_TRANSFER_SLOTS, {}
+    )
+    if source not in slots:
+        slots[source] = asyncio.Semaphore(MAX_PARALLEL_TRANSFERS)
+    return slots[source]
+
+
+class BulkTransfer:
+    """Send one payload to a die with the bulk protocol."""
+
+    def __init__(
+        self,
+        write: Callable[[bytes, bool], Awaitable[None]],
+        data: bytes,
+        chunk_size: int,
+        *,
+        request: bytes | None = None,
+        window: int = DEFAULT_WINDOW,
+        ack_timeout: float = DEFAULT_ACK_TIMEOUT,
+        progress: ProgressCallback | None = None,
+    ) -> None:
+        if len(data) > MAX_BULK_SIZE:
+            raise ValueError(f"Payload of {len(data)} bytes is too large")
+        if request is not None and (not request or request[0] not in TRANSFER_REQUESTS):
+            raise ValueError("Unknown transfer request")
+        self._write = write
+        self._data = data
+        self._chunk_size = chunk_size
+        self._request = request
+        self._window = window
+        self._ack_timeout = ack_timeout
+        self._progress = progress
+        # message type -> future resolved with the next message of that type
+        self._replies: dict[int, asyncio.Future[bytes]] = {}
+        # offset -> future resolved by the chunk's bulkDataAck
+        self._chunk_acks: dict[int, asyncio.Future[None]] = {}
+        self.bytes_acked = 0
+
+    def handle_message(self, data: bytes | bytearray) -> bool:
+        """Resolve the reply ``data`` belongs to; return True if it was one."""
+        if (reply := self._replies.pop(data[0], None)) is not None:
+            if not reply.done():
+                reply.set_result(bytes(data))
+            return True
+        if data[0] == BULK_DATA_ACK and len(data) >= BULK_DATA_ACK_FORMAT.size:
+            _, offset = BULK_DATA_ACK_FORMAT.unpack_from(data)
+            future = self._chunk_acks.get(offset)
+            if future is not None and not future.done():
+                future.set_result(None)
+            return True
+        return False
+
+    async def async_run(self) -> dict[str, Any]:
+        """Transfer the payload and return its size and duration.
+
+        Raises TimeoutError if the die stops answering and ValueError if it
+        refuses the transfer request.
+        """
+        started = time.monotonic()
+        finished = None
+        if self._request is not None:
+            ack_type, finished_type = TRANSFER_REQUESTS[self._request[0]]
+            # The die may report it is done right after the last chunk's ack
+            finished = self._expect(finished_type)
+            ack = await self._async_request(self._request, ack_type)
+            if len(ack) > 1 and not ack[1]:
+                raise ValueError("The die refused the transfer")
+        await self._async_request(
+            BULK_SETUP_FORMAT.pack(BULK_SETUP, len(self._data)), BULK_SETUP_ACK
+        )
+        await self._async_send_chunks(started)
+        if finished is not None:
+            async with asyncio.timeout(self._ack_timeout):
+                await finished
+
+        seconds = time.monotonic() - started
+        return {
+            "bytes": len(self._data),
+            "seconds": round(seconds, 3),
+            "bytes_per_second": round(len(self._data) / seconds) if seconds else None,
+        }
+
+    def _expect(self, message_type: int) -> asyncio.Future[bytes]:
+        """Return a future resolved with the next message of ``message_type``."""
+        reply = asyncio.get_running_loop().create_future()
+        self._replies[message_type] = reply
+        return reply
+
+    async def _async_request(self, message: bytes, reply_type: int) -> bytes:
+        """Write ``message`` and return the die's reply to it."""
+        reply = self._expect(reply_type)
+        await self._write(message, False)
+        async with asyncio.timeout(self._ack_timeout):
+            return await reply
+
+    async def _async_send_chunks(self, started: float) -> None:
+        """Write every chunk, keeping up to ``window`` unacknowledged."""
+        loop = asyncio.get_running_loop()
+        in_flight: set[asyncio.Task[None]] = set()
+        try:
+            for offset in range(0, len(self._data), self._chunk_size):
+                if len(in_flight) >= self._window:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task.result()
+                chunk = self._data[offset : offset + self._chunk_size]
+                ack = loop.create_future()
+                self._chunk_acks[offset] = ack
+                await self._write(
+                    BULK_DATA_HEADER.pack(BULK_DATA, len(chunk), offset) + chunk, False
+                )
+                in_flight.add(
+                    loop.create_task(self._async_wait_ack(ack, len(chunk), started))
+                )
+            for task in asyncio.as_completed(in_flight):
+                await task
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _async_wait_ack(
+        self, ack: asyncio.Future[None], size: int, started: float
+    ) -> None:
+        """Wait for a chunk's ack and report progress."""
+        async with asyncio.timeout(self._ack_timeout):
+            await ack
+        self.bytes_acked += size
+        if self._progress is not None:
+            elapsed = time.monotonic() - started
+            self._progress(
+                self.bytes_acked,
+                len(self._data),
+                self.bytes_acked / elapsed if elapsed else 0.0,
+            )
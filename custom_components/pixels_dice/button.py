@@ -5,7 +5,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import CONF_HUB, DATA_HUBS, DOMAIN
 from .sensor import PixelsDiceDevice, PixelsDiceEntity  # Import base classes
 
 _LOGGER = logging.getLogger(__name__)
@@ -17,13 +17,22 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Pixels Dice button platform."""
     _LOGGER.debug("Setting up Pixels Dice button platform from config entry")
+    if config_entry.data.get(CONF_HUB):
+        hub = hass.data[DATA_HUBS][config_entry.entry_id]
+        hub.async_register_platform(async_add_entities, async_create_entities)
+        return
+
     unique_id = config_entry.unique_id
     pixels_device = hass.data[DOMAIN][unique_id] # Retrieve the shared device instance
+    async_add_entities(async_create_entities(pixels_device))
+
 
-    async_add_entities([
+def async_create_entities(pixels_device: PixelsDiceDevice) -> list[ButtonEntity]:
+    """Return the buttons of a die."""
+    return [
         PixelsDiceConnectButton(pixels_device),
         PixelsDiceDisconnectButton(pixels_device),
-    ])
+    ]
 
 
 class PixelsDiceConnectButton(PixelsDiceEntity, ButtonEntity):
@@ -0,0 +1,186 @@
+"""Per-die GATT command queue for Pixels Dice."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 16
+DEFAULT_ACK_TIMEOUT = 2.0
+
+
+class CommandPriority(IntEnum):
+    """Priority of a queued die command, lowest value is sent first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass(order=True)
+class _Command:
+    """A single write waiting in the queue."""
+
+    priority: int
+    seq: int
+    payload: bytes = field(compare=False)
+    key: str | None = field(compare=False)
+    ack_type: int | None = field(compare=False)
+    response: bool = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class PixelsCommandQueue:
+    """Serialise, prioritise and coalesce writes to a single die.
+
+    Only one write is on the air at a time. Commands that expect an
+    acknowledgement message hold the queue until the ack arrives (or times
+    out), and callers block in ``async_send`` once ``max_pending`` commands are
+    waiting, so a slow die pushes back on automations instead of piling up
+    writes. The highest priority command is picked for every write, so urgent
+    commands only ever wait for the one write on the air.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes, bool], Awaitable[None]],
+        *,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        ack_timeout: float = DEFAULT_ACK_TIMEOUT,
+    ) -> None:
+        self._write = write
+        self._ack_timeout = ack_timeout
+        self._heap: list[_Command] = []
+        self._pending_keys: dict[str, _Command] = {}
+        self._seq = itertools.count()
+        self._slots = asyncio.Semaphore(max_pending)
+        self._ack: tuple[int, asyncio.Future] | None = None
+        # Command on the air
+        self._in_flight: _Command | None = None
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of commands waiting to be written."""
+        return len(self._heap)
+
+    async def async_send(
+        self,
+        payload: bytes,
+        *,
+        priority: CommandPriority = CommandPriority.NORMAL,
+        key: str | None = None,
+        ack_type: int | None = None,
+        response: bool = False,
+    ) -> None:
+        """Queue a command and wait until it has been written (and acked).
+
+        If ``key`` is given and a command with the same key is still waiting,
+        the new request joins the pending one instead of queueing a duplicate.
+        """
+        if key is not None and (existing := self._pending_keys.get(key)):
+            if priority < existing.priority:
+                existing.priority = priority
+                heapq.heapify(self._heap)
+            await asyncio.shield(existing.future)
+            return
+
+        await self._slots.acquire()
+        command = _Command(
+            priority,
+            next(self._seq),
+            bytes(payload),
+            key,
+            ack_type,
+            response,
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._heap, command)
+        if key is not None:
+            self._pending_keys[key] = command
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._async_run())
+        await asyncio.shield(command.future)
+
+    def handle_message(self, message_type: int) -> bool:
+        """Resolve the outstanding ack if ``message_type`` matches it."""
+        if self._ack is None or self._ack[0] != message_type:
+            return False
+        if not self._ack[1].done():
+            self._ack[1].set_result(None)
+        return True
+
+    def clear(self, err: Exception | None = None) -> None:
+        """Drop every queued command, failing their waiters with ``err``."""
+        err = err or ConnectionError("Command queue cleared")
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._ack is not None and not self._ack[1].done():
+            self._ack[1].cancel()
+        self._ack = None
+        if self._in_flight is not None:
+            self._finish(self._in_flight, err)
+            self._in_flight = None
+        while self._heap:
+            self._finish(self._heap.pop(), err)
+        self._pending_keys.clear()
+
+    async def _async_run(self) -> None:
+        """Write queued commands until the queue is empty."""
+        try:
+            while self._heap:
+                command = heapq.heappop(self._heap)
+                if command.key is not None:
+                    self._pending_keys.pop(command.key, None)
+                self._in_flight = command
+                try:
+                    await self._async_write_command(command)
+                except asyncio.CancelledError:
+                    # ``clear`` has already failed the command it interrupted
+                    if self._in_flight is command:
+                        self._in_flight = None
+                        self._finish(command, ConnectionError("Command queue cleared"))
+                    raise
+                except Exception as err:
+                    _LOGGER.debug(
+                        "Die command %s failed: %s", command.payload.hex(), err
+                    )
+                    self._finish(command, err)
+                else:
+                    self._finish(command)
+                self._in_flight = None
+        finally:
+            if self._worker is asyncio.current_task():
+                self._worker = None
+
+    def _finish(self, command: _Command, err: Exception | None = None) -> None:
+        """Resolve a command's future and free its queue slot."""
+        if not command.future.done():
+            if err is None:
+                command.future.set_result(None)
+            else:
+                command.future.set_exception(err)
+        self._slots.release()
+
+    async def _async_write_command(self, command: _Command) -> None:
+        """Write one command and wait for its ack if it expects one."""
+        if command.ack_type is None:
+            await self._write(command.payload, command.response)
+            return
+
+        ack = asyncio.get_running_loop().create_future()
+        self._ack = (command.ack_type, ack)
+        try:
+            await self._write(command.payload, command.response)
+            async with asyncio.timeout(self._ack_timeout):
+                await ack
+        finally:
+            if self._ack is not None and self._ack[1] is ack:
+                self._ack = None
@@ -2,9 +2,21 @@ import logging
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
+from .const import (
+    CONF_AUTOCONNECT,
+    CONF_DICE,
+    CONF_FACE_ACTIONS,
+    CONF_HUB,
+    CONF_PUSH_TARGETS,
+    CONF_TELEMETRY,
+    DOMAIN,
+)
+from .face_actions import parse_face_actions
+from .hub import parse_dice
+from .push import parse_push_targets
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -13,22 +25,184 @@ DATA_SCHEMA = vol.Schema({
     vol.Optional("autoconnect", default=False): bool,
 })
 
+def configured_dice(hass: HomeAssistant, dice: list[str]) -> list[str]:
+    """Return the dice that already have a config entry of their own."""
+    return [
+        name
+        for name in dice
+        if (entry := hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, name))
+        and not entry.data.get(CONF_HUB)
+    ]
+
+
+def face_action_errors(user_input: dict) -> dict[str, str]:
+    """Return the form errors of the face action table in ``user_input``."""
+    try:
+        parse_face_actions(user_input.get(CONF_FACE_ACTIONS, ""))
+    except vol.Invalid:
+        return {CONF_FACE_ACTIONS: "invalid_face_action"}
+    return {}
+
+
+def push_target_errors(user_input: dict) -> dict[str, str]:
+    """Return the form errors of the push targets in ``user_input``."""
+    try:
+        parse_push_targets(user_input.get(CONF_PUSH_TARGETS, ""))
+    except vol.Invalid:
+        return {CONF_PUSH_TARGETS: "invalid_push_target"}
+    return {}
+
+
+def hub_dice(hass: HomeAssistant) -> set[str]:
+    """Return the dice managed by hub entries."""
+    return {
+        name
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.data.get(CONF_HUB)
+        for name in entry.options.get(CONF_DICE, [])
+    }
+
+
 class PixelsDiceConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Pixels Dice."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return PixelsDiceOptionsFlow()
+
     async def async_step_user(self, user_input=None) -> FlowResult:
-        """Handle the initial step."""
+        """Choose between a single die and a hub managing many dice."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["die", "hub"],
+        )
+
+    async def async_step_die(self, user_input=None) -> FlowResult:
+        """Handle the setup of a single die."""
         errors = {}
         if user_input is not None:
             # TODO: Add validation for the die name if necessary
             # For now, we just accept it.
             await self.async_set_unique_id(user_input["name"])
             self._abort_if_unique_id_configured()
+            if user_input["name"] in hub_dice(self.hass):
+                return self.async_abort(reason="already_configured")
 
             return self.async_create_entry(title=user_input["name"], data=user_input)
 
         return self.async_show_form(
-            step_id="user", data_schema=DATA_SCHEMA, errors=errors
+            step_id="die", data_schema=DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_hub(self, user_input=None) -> FlowResult:
+        """Handle the setup of the hub."""
+        # Hubs have no unique id, which could collide with a die's name
+        if any(entry.data.get(CONF_HUB) for entry in self._async_current_entries()):
+            return self.async_abort(reason="already_configured")
+
+        errors = {}
+        if user_input is not None:
+            dice = parse_dice(user_input[CONF_DICE])
+            if configured_dice(self.hass, dice):
+                errors[CONF_DICE] = "already_configured"
+            else:
+                return self.async_create_entry(
+                    title=user_input["name"],
+                    data={CONF_HUB: True},
+                    options={
+                        CONF_DICE: dice,
+                        CONF_AUTOCONNECT: user_input[CONF_AUTOCONNECT],
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=vol.Schema({
+                vol.Required("name", default="Pixels Dice"): str,
+                vol.Optional(CONF_DICE, default=""): str,
+                vol.Optional(CONF_AUTOCONNECT, default=False): bool,
+            }),
+            errors=errors,
+        )
+
+
+class PixelsDiceOptionsFlow(config_entries.OptionsFlow):
+    """Handle Pixels Dice options."""
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the options."""
+        if self.config_entry.data.get(CONF_HUB):
+            return await self.async_step_hub(user_input)
+
+        errors = {}
+        if user_input is not None:
+            errors.update(push_target_errors(user_input))
+            errors.update(face_action_errors(user_input))
+            if not errors:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_PUSH_TARGETS,
+                    default=options.get(CONF_PUSH_TARGETS, ""),
+                ): str,
+                vol.Optional(
+                    CONF_TELEMETRY,
+                    default=options.get(CONF_TELEMETRY, False),
+                ): bool,
+                vol.Optional(
+                    CONF_FACE_ACTIONS,
+                    default=options.get(CONF_FACE_ACTIONS, ""),
+                ): str,
+            }),
+            errors=errors,
+        )
+
+    async def async_step_hub(self, user_input=None) -> FlowResult:
+        """Manage the dice of the hub."""
+        errors = {}
+        if user_input is not None:
+            dice = parse_dice(user_input[CONF_DICE])
+            if configured_dice(self.hass, dice):
+                errors[CONF_DICE] = "already_configured"
+            errors.update(push_target_errors(user_input))
+            errors.update(face_action_errors(user_input))
+            if not errors:
+                return self.async_create_entry(data={**user_input, CONF_DICE: dice})
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_DICE,
+                    default=", ".join(options.get(CONF_DICE, [])),
+                ): str,
+                vol.Optional(
+                    CONF_AUTOCONNECT,
+                    default=options.get(CONF_AUTOCONNECT, False),
+                ): bool,
+                vol.Optional(
+                    CONF_PUSH_TARGETS,
+                    default=options.get(CONF_PUSH_TARGETS, ""),
+                ): str,
+                vol.Optional(
+                    CONF_TELEMETRY,
+                    default=options.get(CONF_TELEMETRY, False),
+                ): bool,
+                vol.Optional(
+                    CONF_FACE_ACTIONS,
+                    default=options.get(CONF_FACE_ACTIONS, ""),
+                ): str,
+            }),
+            errors=errors,
         )
@@ -1 +1,32 @@
 DOMAIN = "pixels_dice"
+
+# Config entry data
+CONF_AUTOCONNECT = "autoconnect"
+CONF_HUB = "hub"
+CONF_IDENTITY = "identity"
+CONF_IDENTITIES = "identities"
+
+# Options
+CONF_DICE = "dice"
+CONF_FACE_ACTIONS = "face_actions"
+CONF_PUSH_TARGETS = "push_targets"
+CONF_TELEMETRY = "telemetry"
+
+# hass.data key of the hub managers, by config entry id
+DATA_HUBS = f"{DOMAIN}_hubs"
+
+# Dispatcher signal sent with every die set up, including dice added later
+SIGNAL_DIE_ADDED = f"{DOMAIN}_die_added"
+
+# Fired on the event bus every time a die lands
+EVENT_ROLL = f"{DOMAIN}_roll"
+
+# Fired as a profile upload to a die progresses
+EVENT_UPLOAD_PROGRESS = f"{DOMAIN}_upload_progress"
+
+# Roll state codes (PixelRollStateValues in DieMessages.ts)
+ROLL_STATE_ROLLED = 0x01
+ROLL_STATE_HANDLING = 0x02
+ROLL_STATE_ROLLING = 0x03
+ROLL_STATE_CROOKED = 0x04
+ROLL_STATE_ON_FACE = 0x05
@@ -11,10 +11,12 @@ from homeassistant.const import (
     CONF_PLATFORM,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import DOMAIN
+from .latency import STAGE_TRIGGER_MATCH, async_get_trace
 
 CONF_FROM = "from"
 CONF_TO = "to"
@@ -36,11 +38,18 @@ TRIGGER_SCHEMA = vol.Schema(
 async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict[str, Any]]:
     """Return a list of triggers for the device."""
     triggers: list[dict[str, Any]] = []
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return triggers
+    # Match whole unique ids; other sensors (e.g. "_time_on_face") share suffixes
+    dice = {identifier for domain, identifier in device.identifiers if domain == DOMAIN}
+    face_ids = {f"{die}_face" for die in dice}
+    state_ids = {f"{die}_state" for die in dice}
     ent_reg = er.async_get(hass)
     for entry in er.async_entries_for_device(ent_reg, device_id, True):
         if entry.domain != "sensor" or entry.platform != DOMAIN:
             continue
-        if entry.unique_id.endswith("_face"):
+        if entry.unique_id in face_ids:
             triggers.append(
                 {
                     CONF_PLATFORM: "device",
@@ -50,7 +59,7 @@ async def async_get_triggers(hass: HomeAssistant, device_id: str) -> list[dict[s
                     "type": "face",
                 }
             )
-        elif entry.unique_id.endswith("_state"):
+        elif entry.unique_id in state_ids:
             triggers.append(
                 {
                     CONF_PLATFORM: "device",
@@ -86,6 +95,10 @@ async def async_attach_trigger(
             return
         if to_state is not None and (new is None or new.state != to_state):
             return
-        await action({})
+        # Writes caused by a roll carry its trace context; pass it on so the
+        # automation's context is parented to it.
+        if trace := async_get_trace(hass, event.context):
+            trace.mark(STAGE_TRIGGER_MATCH)
+        await action({}, event.context)
 
     return async_track_state_change_event(hass, [entity_id], state_changed)
@@ -0,0 +1,78 @@
+"""Diagnostics support for Pixels Dice."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HUB, DATA_HUBS, DOMAIN
+from .sensor import PixelsDiceDevice
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_diagnostics = {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+    }
+    if entry.data.get(CONF_HUB):
+        hub = hass.data[DATA_HUBS][entry.entry_id]
+        return {
+            "entry": entry_diagnostics,
+            "dice": {
+                name: _device_diagnostics(pixels_device)
+                for name, pixels_device in hub.dice.items()
+            },
+        }
+    return {
+        "entry": entry_diagnostics,
+        **_device_diagnostics(hass.data[DOMAIN][entry.unique_id]),
+    }
+
+
+def _device_diagnostics(pixels_device: PixelsDiceDevice) -> dict[str, Any]:
+    """Return the diagnostics of one die."""
+    return {
+        "device": {
+            "state": pixels_device._state,
+            "face": pixels_device._face,
+            "rssi": pixels_device._rssi,
+            "last_seen": pixels_device._last_seen,
+            "autoconnect": pixels_device.autoconnect,
+        },
+        "identity": (
+            {
+                **pixels_device.identity.as_dict(),
+                "die_type_name": pixels_device.identity.die_type_name,
+                "firmware": pixels_device.identity.firmware,
+            }
+            if pixels_device.identity
+            else None
+        ),
+        "advertisements": {
+            "suppressed_duplicates": pixels_device.advertisements.suppressed,
+            "best_source": pixels_device.advertisements.best_source,
+        },
+        "connection": {
+            "disconnects": pixels_device.disconnect_count,
+            "last_resume_ms": pixels_device.last_resume_ms,
+        },
+        "face_actions": (
+            pixels_device.face_actions.as_dict()
+            if pixels_device.face_actions
+            else None
+        ),
+        "latency_ms": pixels_device.latency.as_dict(),
+        "roll_timing_ms": pixels_device.roll_timer.as_dict(),
+        "motion": (
+            {
+                "last_roll": pixels_device.telemetry.last_roll,
+                "windows": pixels_device.telemetry.windows(),
+            }
+            if pixels_device.telemetry
+            else None
+        ),
+    }
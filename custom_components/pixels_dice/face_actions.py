@@ -0,0 +1,217 @@
+"""Service calls run directly when a die lands on a face.
+
+A face action table maps faces or face ranges to service calls, e.g.
+``20=scene.turn_on:scene.flash, 1-3=light.turn_on:light.table``. The table is
+compiled into a list indexed by face value, so a landing costs one list lookup
+and no state machine, trigger matching or automation run.
+
+Calls are rate limited per target (service and entity): a target is skipped
+while a call to it is within ``MIN_INTERVAL`` of the last one, or while
+``MAX_IN_FLIGHT`` calls to it are still running.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import ROLL_STATE_ROLLED
+from .latency import STAGE_ACTION_START, RollTrace
+
+if TYPE_CHECKING:
+    from .sensor import PixelsDiceDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Highest face value a die can show (a d00 shows 0-90)
+MAX_FACE = 100
+
+# Seconds between two calls to the same target
+MIN_INTERVAL = 0.5
+# Calls to the same target that may run at once
+MAX_IN_FLIGHT = 1
+
+
+@dataclass(frozen=True, slots=True)
+class FaceAction:
+    """A service call for the faces ``first`` to ``last``."""
+
+    first: int
+    last: int
+    service: str
+    entity_id: str | None = None
+
+    @property
+    def target(self) -> str:
+        """Return the key calls are rate limited by."""
+        return f"{self.service}:{self.entity_id}" if self.entity_id else self.service
+
+
+def parse_face_action(value: str) -> FaceAction:
+    """Parse ``faces=domain.service[:entity_id]``, faces being ``N`` or ``N-M``."""
+    faces, _, call = value.strip().partition("=")
+    service, _, entity_id = call.strip().partition(":")
+    first, _, last = faces.strip().partition("-")
+    try:
+        action = FaceAction(
+            int(first),
+            int(last or first),
+            cv.service(service.strip()),
+            cv.entity_id(entity_id.strip()) if entity_id.strip() else None,
+        )
+    except (ValueError, vol.Invalid) as err:
+        raise vol.Invalid(f"Invalid face action {value!r}") from err
+    if not 0 <= action.first <= action.last <= MAX_FACE:
+        raise vol.Invalid(f"Invalid faces in face action {value!r}")
+    return action
+
+
+def parse_face_actions(value: str) -> list[FaceAction]:
+    """Parse a comma separated list of face actions."""
+    return [parse_face_action(action) for action in value.split(",") if action.strip()]
+
+
+def compile_face_actions(
+    actions: Iterable[FaceAction],
+) -> list[tuple[FaceAction, ...]]:
+    """Return the actions of every face, indexed by face value."""
+    actions = list(actions)
+    table: list[list[FaceAction]] = [
+        [] for _ in range(max((action.last for action in actions), default=-1) + 1)
+    ]
+    for action in actions:
+        for face in range(action.first, action.last + 1):
+            table[face].append(action)
+    return [tuple(face_actions) for face_actions in table]
+
+
+class _Target:
+    """Rate limiting state of one service call target."""
+
+    __slots__ = ("in_flight", "last_call")
+
+    def __init__(self) -> None:
+        self.last_call = -math.inf
+        self.in_flight = 0
+
+
+class FaceActionEngine:
+    """Run a face action table for the rolls of one or more dice."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        actions: Iterable[FaceAction],
+        *,
+        min_interval: float = MIN_INTERVAL,
+        max_in_flight: int = MAX_IN_FLIGHT,
+    ) -> None:
+        self.hass = hass
+        self._table = compile_face_actions(actions)
+        self._targets = {
+            action.target: _Target() for face_actions in self._table for action in face_actions
+        }
+        self._min_interval = min_interval
+        self._max_in_flight = max_in_flight
+        # unique_id -> (die, unsubscribe from its rolls)
+        self._attached: dict[str, tuple[PixelsDiceDevice, Callable[[], None]]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.calls = 0
+        self.throttled = 0
+        self.errors = 0
+
+    @callback
+    def async_attach(self, pixels_device: PixelsDiceDevice) -> None:
+        """Run the table when ``pixels_device`` lands."""
+        if pixels_device.unique_id not in self._attached:
+            self._attached[pixels_device.unique_id] = (
+                pixels_device,
+                pixels_device.register_roll_listener(self._handle_roll),
+            )
+            pixels_device.face_actions = self
+
+    @callback
+    def async_detach(self, pixels_device: PixelsDiceDevice) -> None:
+        """Stop running the table for ``pixels_device``."""
+        if attached := self._attached.pop(pixels_device.unique_id, None):
+            attached[1]()
+            pixels_device.face_actions = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Detach every die and cancel running calls."""
+        for pixels_device, unsub in self._attached.values():
+            unsub()
+            pixels_device.face_actions = None
+        self._attached.clear()
+        for task in self._tasks:
+            task.cancel()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return call counters for diagnostics."""
+        return {
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "errors": self.errors,
+        }
+
+    @callback
+    def _handle_roll(
+        self, pixels_device: PixelsDiceDevice, state_code: int, face: int | None
+    ) -> None:
+        """Start the calls mapped to the face the die landed on."""
+        if state_code != ROLL_STATE_ROLLED or face is None or face >= len(self._table):
+            return
+        face_actions = self._table[face]
+        if not face_actions:
+            return
+        now = time.monotonic()
+        trace = pixels_device.roll_trace
+        for action in face_actions:
+            target = self._targets[action.target]
+            if (
+                target.in_flight >= self._max_in_flight
+                or now - target.last_call < self._min_interval
+            ):
+                self.throttled += 1
+                continue
+            target.last_call = now
+            target.in_flight += 1
+            self.calls += 1
+            task = self.hass.async_create_task(
+                self._async_call(action, target, trace),
+                f"pixels_dice face action {action.target}",
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _async_call(
+        self, action: FaceAction, target: _Target, trace: RollTrace | None
+    ) -> None:
+        """Call the action's service and release its target."""
+        domain, service = action.service.split(".", 1)
+        # Parented to the roll like an automation the roll triggered
+        context = Context(parent_id=trace.context.id) if trace else None
+        if trace is not None:
+            trace.mark(STAGE_ACTION_START)
+        try:
+            await self.hass.services.async_call(
+                domain,
+                service,
+                {"entity_id": action.entity_id} if action.entity_id else None,
+                blocking=True,
+                context=context,
+            )
+        except Exception as err:  # one failing action must not stop the table
+            self.errors += 1
+            _LOGGER.warning("Face action %s failed: %s", action.target, err)
+        finally:
+            target.in_flight -= 1
@@ -0,0 +1,207 @@
+"""Hub config entry managing a fleet of Pixels Dice.
+
+A hub entry owns every die listed in its options. Platforms are forwarded once
+for the hub; each platform registers an entity factory with the hub, which
+creates entities for the dice it has now and for dice added later. Adding or
+removing a die in the options takes effect without reloading the entry.
+
+The hub registers one advertisement callback for all its dice, matching the
+Pixels service UUID, and dispatches advertisements by local name, instead of
+one Bluetooth callback per die.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_AUTOCONNECT,
+    CONF_DICE,
+    CONF_FACE_ACTIONS,
+    CONF_IDENTITIES,
+    CONF_PUSH_TARGETS,
+    CONF_TELEMETRY,
+    DOMAIN,
+)
+from .face_actions import FaceActionEngine, parse_face_actions
+from .identity import DieIdentity
+from .push import RollPushSink, parse_push_targets
+from .sensor import PIXEL_SERVICE_UUID, PixelsDiceDevice, async_shutdown_dice
+
+_LOGGER = logging.getLogger(__name__)
+
+type EntityFactory = Callable[[PixelsDiceDevice], list[Entity]]
+
+
+def parse_dice(value: str) -> list[str]:
+    """Parse a comma separated list of die names, dropping duplicates."""
+    return list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+
+
+class HubDie:
+    """A die owned by a hub, its entities and its push sink."""
+
+    __slots__ = ("device", "entities", "push_sink")
+
+    def __init__(self, device: PixelsDiceDevice) -> None:
+        self.device = device
+        self.entities: list[Entity] = []
+        self.push_sink: RollPushSink | None = None
+
+
+class PixelsDiceHub:
+    """Own the dice of a hub entry and their entities."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self.entry = entry
+        self._dice: dict[str, HubDie] = {}
+        self._platforms: list[tuple[AddEntitiesCallback, EntityFactory]] = []
+        # One table for all the hub's dice, so they share its rate limits
+        self.face_actions: FaceActionEngine | None = None
+        if face_actions := entry.options.get(CONF_FACE_ACTIONS):
+            self.face_actions = FaceActionEngine(hass, parse_face_actions(face_actions))
+        self._push_targets = parse_push_targets(entry.options.get(CONF_PUSH_TARGETS, ""))
+        self._unsub_bluetooth: Callable[[], None] | None = None
+
+    @property
+    def dice(self) -> dict[str, PixelsDiceDevice]:
+        """Return the hub's dice by name."""
+        return {name: die.device for name, die in self._dice.items()}
+
+    async def async_setup(self) -> None:
+        """Create the dice listed in the entry's options and start scanning."""
+        for name in self.entry.options.get(CONF_DICE, []):
+            await self.async_add_die(name)
+        self._unsub_bluetooth = bluetooth.async_register_callback(
+            self.hass,
+            self._async_handle_advertisement,
+            bluetooth.BluetoothCallbackMatcher(
+                service_uuid=PIXEL_SERVICE_UUID, connectable=True
+            ),
+            BluetoothScanningMode.ACTIVE,
+        )
+
+    async def async_unload(self) -> None:
+        """Stop every die at once; entities go away with the platforms."""
+        if self._unsub_bluetooth is not None:
+            self._unsub_bluetooth()
+            self._unsub_bluetooth = None
+        devices = [self._forget_die(name) for name in list(self._dice)]
+        self._platforms.clear()
+        if self.face_actions is not None:
+            self.face_actions.async_stop()
+        await async_shutdown_dice(devices)
+
+    @callback
+    def async_register_platform(
+        self, async_add_entities: AddEntitiesCallback, factory: EntityFactory
+    ) -> None:
+        """Add a platform's entities for every die, now and when dice are added."""
+        self._platforms.append((async_add_entities, factory))
+        for die in self._dice.values():
+            self._async_add_entities(die, async_add_entities, factory)
+
+    async def async_add_die(self, name: str) -> PixelsDiceDevice:
+        """Start managing a die and add its entities."""
+        if name in self._dice:
+            return self._dice[name].device
+        identity = self.entry.data.get(CONF_IDENTITIES, {}).get(name)
+        device = PixelsDiceDevice(
+            self.hass,
+            name,
+            name,
+            self.entry.options.get(CONF_AUTOCONNECT, False),
+            DieIdentity.from_dict(identity) if identity else None,
+            self.entry.options.get(CONF_TELEMETRY, False),
+        )
+        device.hub = self
+        die = self._dice[name] = HubDie(device)
+        self.hass.data[DOMAIN][name] = device
+        await device.async_added_to_hass()
+        device.statistics.async_start()
+        if self.face_actions is not None:
+            self.face_actions.async_attach(device)
+        if self._push_targets:
+            die.push_sink = RollPushSink(self.hass, device, self._push_targets)
+            await die.push_sink.async_start()
+        for async_add_entities, factory in self._platforms:
+            self._async_add_entities(die, async_add_entities, factory)
+        return device
+
+    async def async_remove_die(self, name: str) -> None:
+        """Stop managing a die and remove its entities and device."""
+        if name not in self._dice:
+            return
+        entities = self._dice[name].entities
+        pixels_device = self._forget_die(name)
+        await async_shutdown_dice([pixels_device])
+        for entity in entities:
+            await entity.async_remove(force_remove=True)
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, name)}):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=self.entry.entry_id
+            )
+
+    async def async_update_dice(self, names: list[str]) -> None:
+        """Add and remove dice so the hub manages exactly ``names``."""
+        for name in [name for name in self._dice if name not in names]:
+            await self.async_remove_die(name)
+        for name in names:
+            await self.async_add_die(name)
+
+    @callback
+    def _async_handle_advertisement(
+        self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        """Pass an advertisement to the die with its local name."""
+        if (die := self._dice.get(service_info.name)) is not None:
+            die.device.handle_advertisement(service_info, change)
+
+    @callback
+    def async_store_identity(self, device: PixelsDiceDevice) -> None:
+        """Remember a die's identity in the hub entry."""
+        identities: dict[str, Any] = dict(self.entry.data.get(CONF_IDENTITIES, {}))
+        if identities.get(device.unique_id) == device.identity.as_dict():
+            return
+        identities[device.unique_id] = device.identity.as_dict()
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, CONF_IDENTITIES: identities}
+        )
+
+    @callback
+    def _async_add_entities(
+        self,
+        die: HubDie,
+        async_add_entities: AddEntitiesCallback,
+        factory: EntityFactory,
+    ) -> None:
+        """Create one platform's entities for a die."""
+        entities = factory(die.device)
+        die.entities.extend(entities)
+        async_add_entities(entities)
+
+    @callback
+    def _forget_die(self, name: str) -> PixelsDiceDevice:
+        """Stop managing a die and return it for shutdown."""
+        self.hass.data[DOMAIN].pop(name, None)
+        die = self._dice.pop(name)
+        if die.push_sink is not None:
+            die.push_sink.async_stop()
+        if self.face_actions is not None:
+            self.face_actions.async_detach(die.device)
+        return die.device
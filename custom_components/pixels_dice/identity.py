@@ -0,0 +1,199 @@
+"""Die identity reported by the Pixels WhoAreYou/IAmADie exchange.
+
+The identity only changes with a firmware update, so it is stored in the config
+entry once and reused on every later connection.
+
+Dice answer WhoAreYou in one of two layouts. Older firmware sends a fixed
+22-byte struct; current firmware sends the message type followed by chunks that
+each start with their own size, so chunks can grow without breaking readers.
+"""
+from __future__ import annotations
+
+import struct
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+# Legacy IAmADie (LegacyIAmADie in Messages.ts): type, ledCount, colorway,
+# dieType, dataSetHash, pixelId, availableFlashSize, buildTimestamp,
+# rollState, rollFaceIndex, batteryLevelPercent, batteryState
+LEGACY_I_AM_A_DIE_FORMAT = struct.Struct("<BBBBIIHIBBBB")
+
+# Chunks of the current IAmADie, in message order (Messages.ts). Only the
+# leading fields we use are listed; a chunk may be longer than its format.
+# versionInfo: chunkSize, firmwareVersion, buildTimestamp, settingsVersion,
+# compatStandardApiVersion, compatExtendedApiVersion, compatManagementApiVersion
+VERSION_INFO_FORMAT = struct.Struct("<BHIHHHH")
+# dieInfo: chunkSize, pixelId, chipModel, dieType, ledCount, colorway, runMode
+DIE_INFO_FORMAT = struct.Struct("<BIBBBBB")
+# settingsInfo: chunkSize, profileDataHash, availableFlash, totalUsableFlash
+SETTINGS_INFO_FORMAT = struct.Struct("<BIII")
+# versionInfo, dieInfo, customDesignAndColorName, dieName, settingsInfo
+# (the statusInfo chunk that follows is not needed)
+I_AM_A_DIE_CHUNKS = 5
+
+# Most LEDs a Pixels die has (the pipped d6 has 21)
+MAX_LED_COUNT = 32
+
+# PixelDieTypeValues -> (name, number of faces)
+DIE_TYPES: dict[int, tuple[str, int]] = {
+    1: ("d4", 4),
+    2: ("d6", 6),
+    3: ("d8", 8),
+    4: ("d10", 10),
+    5: ("d00", 10),
+    6: ("d12", 12),
+    7: ("d20", 20),
+    8: ("d6pipped", 6),
+    9: ("d6fudge", 6),
+}
+
+# Die type to assume from the LED count when old firmware reports "unknown"
+DIE_TYPES_BY_LED_COUNT = {4: 1, 6: 2, 8: 3, 10: 4, 12: 6, 20: 7}
+
+# PixelColorwayValues
+COLORWAYS = {
+    1: "onyxBlack",
+    2: "hematiteGrey",
+    3: "midnightGalaxy",
+    4: "auroraSky",
+    5: "clear",
+    6: "whiteAurora",
+    255: "custom",
+}
+
+
+def decode_i_am_a_die(data: bytes | bytearray) -> tuple[DieIdentity, int]:
+    """Decode an IAmADie message into the die's identity and data set hash.
+
+    Raises ValueError if the message has neither layout or describes a die
+    that cannot exist.
+    """
+    if len(data) == LEGACY_I_AM_A_DIE_FORMAT.size:
+        (
+            _message_type,
+            led_count,
+            colorway,
+            die_type,
+            data_hash,
+            pixel_id,
+            _flash_size,
+            build_timestamp,
+            *_,
+        ) = LEGACY_I_AM_A_DIE_FORMAT.unpack(data)
+    else:
+        version_info, die_info, _design, _name, settings_info = _split_chunks(data)
+        _, _firmware_version, build_timestamp, *_ = _unpack_chunk(
+            VERSION_INFO_FORMAT, version_info
+        )
+        _, pixel_id, _chip_model, die_type, led_count, colorway, _run_mode = (
+            _unpack_chunk(DIE_INFO_FORMAT, die_info)
+        )
+        _, data_hash, *_ = _unpack_chunk(SETTINGS_INFO_FORMAT, settings_info)
+
+    if die_type not in DIE_TYPES:
+        die_type = DIE_TYPES_BY_LED_COUNT.get(led_count, 0)
+    identity = DieIdentity(die_type, led_count, colorway, pixel_id, build_timestamp)
+    if not identity.is_valid:
+        raise ValueError(f"Implausible die identity {identity}")
+    return identity, data_hash
+
+
+def _split_chunks(data: bytes | bytearray) -> list[bytes]:
+    """Return the size-prefixed chunks of a chunked IAmADie message."""
+    chunks = []
+    offset = 1
+    for _ in range(I_AM_A_DIE_CHUNKS):
+        if offset >= len(data):
+            raise ValueError("IAmADie message is truncated")
+        size = data[offset]
+        if not size or offset + size > len(data):
+            raise ValueError(f"Invalid IAmADie chunk size {size} at byte {offset}")
+        chunks.append(bytes(data[offset : offset + size]))
+        offset += size
+    return chunks
+
+
+def _unpack_chunk(chunk_format: struct.Struct, chunk: bytes) -> tuple[Any, ...]:
+    """Unpack the leading fields of an IAmADie chunk."""
+    if len(chunk) < chunk_format.size:
+        raise ValueError(f"IAmADie chunk of {len(chunk)} bytes is too short")
+    return chunk_format.unpack_from(chunk)
+
+
+@dataclass(frozen=True, slots=True)
+class DieIdentity:
+    """Type, design and firmware of a die."""
+
+    die_type: int
+    led_count: int
+    colorway: int
+    pixel_id: int
+    build_timestamp: int
+
+    @classmethod
+    def from_message(cls, data: bytes | bytearray) -> DieIdentity:
+        """Decode an IAmADie message, raising ValueError if it is invalid."""
+        return decode_i_am_a_die(data)[0]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DieIdentity:
+        """Restore an identity stored in a config entry."""
+        return cls(**{field: data[field] for field in cls.__dataclass_fields__})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the identity as JSON-serializable data."""
+        return asdict(self)
+
+    @property
+    def is_valid(self) -> bool:
+        """Return True if the identity describes a die that can exist."""
+        return (
+            self.die_type in DIE_TYPES
+            and 0 < self.led_count <= MAX_LED_COUNT
+            and self.build_timestamp > 0
+        )
+
+    @property
+    def die_type_name(self) -> str:
+        """Return the die type, e.g. ``d20``."""
+        return DIE_TYPES.get(self.die_type, ("unknown", 0))[0]
+
+    @property
+    def face_count(self) -> int | None:
+        """Return the number of faces, if the die type is known."""
+        return DIE_TYPES[self.die_type][1] if self.die_type in DIE_TYPES else None
+
+    @property
+    def colorway_name(self) -> str:
+        """Return the die's colorway."""
+        return COLORWAYS.get(self.colorway, "unknown")
+
+    @property
+    def firmware(self) -> str:
+        """Return the firmware build date, which Pixels uses as its version."""
+        return datetime.fromtimestamp(self.build_timestamp, UTC).strftime(
+            "%Y-%m-%d %H:%M"
+        )
+
+    @property
+    def model(self) -> str:
+        """Return a model name such as ``Pixels d20 (onyxBlack)``."""
+        return f"Pixels {self.die_type_name} ({self.colorway_name})"
+
+    @property
+    def face_range(self) -> tuple[int, int] | None:
+        """Return the lowest and highest face value."""
+        if self.face_count is None:
+            return None
+        return self.face_value(0), self.face_value(self.face_count - 1)
+
+    def face_value(self, face_index: int) -> int:
+        """Return the value shown by the face with 0-based index ``face_index``."""
+        if self.die_type_name == "d00":
+            return face_index * 10
+        return face_index + 1
+
+    def is_valid_face_index(self, face_index: int) -> bool:
+        """Return True if the die has a face with this index."""
+        return self.face_count is None or face_index < self.face_count
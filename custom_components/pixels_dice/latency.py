@@ -0,0 +1,140 @@
+"""Roll latency tracing for Pixels Dice.
+
+Every roll-state notification gets a ``RollTrace`` stamped with
+``time.monotonic()`` when it reaches the BLE callback. The trace's ``Context``
+is used for the face/state sensor writes, so it travels with the
+``state_changed`` event into our device triggers and from there (as the parent
+context) into the automation that runs. Each stage the roll reaches records
+the time elapsed since receipt in the die's ``LatencyTracker``.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
+from homeassistant.core import Context, Event, HomeAssistant, callback
+
+from .const import DOMAIN
+
+STAGE_DECODE = "decode"
+STAGE_DISPATCH = "dispatch"
+STAGE_STATE_WRITE = "state_write"
+STAGE_TRIGGER_MATCH = "trigger_match"
+STAGE_ACTION_START = "action_start"
+
+STAGES = (
+    STAGE_DECODE,
+    STAGE_DISPATCH,
+    STAGE_STATE_WRITE,
+    STAGE_TRIGGER_MATCH,
+    STAGE_ACTION_START,
+)
+
+PERCENTILES = (50, 95, 99)
+
+# Number of samples kept per stage, per die
+DEFAULT_WINDOW = 256
+# Number of in-flight traces that can still be matched to a trigger/automation
+MAX_OPEN_TRACES = 64
+
+DATA_ROLL_TRACES = f"{DOMAIN}_roll_traces"
+
+
+def compute_percentiles(samples: Iterable[float]) -> dict[str, float | None]:
+    """Return the p50/p95/p99 (nearest rank) of ``samples``."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{pct}": None for pct in PERCENTILES}
+    return {
+        f"p{pct}": round(ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)], 3)
+        for pct in PERCENTILES
+    }
+
+
+class RollTrace:
+    """Timing of a single roll-state notification."""
+
+    __slots__ = ("context", "received", "recorded", "tracker")
+
+    def __init__(self, tracker: LatencyTracker, received: float) -> None:
+        self.tracker = tracker
+        self.received = received
+        self.context = Context()
+        self.recorded: set[str] = set()
+
+    def mark(self, stage: str) -> float | None:
+        """Record the time since receipt for ``stage`` (once per trace)."""
+        if stage in self.recorded:
+            return None
+        self.recorded.add(stage)
+        elapsed_ms = (time.monotonic() - self.received) * 1000
+        self.tracker.record(stage, elapsed_ms)
+        return elapsed_ms
+
+
+class LatencyTracker:
+    """Sliding window of per-stage roll latencies for one die."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._samples: dict[str, deque[float]] = {
+            stage: deque(maxlen=window) for stage in STAGES
+        }
+
+    def start_trace(self, received: float) -> RollTrace:
+        """Return a new trace for a notification received at ``received``."""
+        return RollTrace(self, received)
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        """Add a latency sample in milliseconds."""
+        self._samples[stage].append(elapsed_ms)
+
+    def percentiles(self, stage: str) -> dict[str, float | None]:
+        """Return p50/p95/p99 for ``stage`` in milliseconds."""
+        return compute_percentiles(self._samples[stage])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of every stage for diagnostics."""
+        return {
+            stage: {"count": len(self._samples[stage]), **self.percentiles(stage)}
+            for stage in STAGES
+        }
+
+
+def async_get_roll_traces(hass: HomeAssistant) -> OrderedDict[str, RollTrace]:
+    """Return the open traces of all dice, keyed by context id."""
+    return hass.data.setdefault(DATA_ROLL_TRACES, OrderedDict())
+
+
+@callback
+def async_open_trace(hass: HomeAssistant, trace: RollTrace) -> None:
+    """Make a trace findable from events carrying its context."""
+    traces = async_get_roll_traces(hass)
+    traces[trace.context.id] = trace
+    if len(traces) > MAX_OPEN_TRACES:
+        traces.popitem(last=False)
+
+
+@callback
+def async_get_trace(hass: HomeAssistant, context: Context | None) -> RollTrace | None:
+    """Return the trace a context belongs to, if it is still open."""
+    if context is None:
+        return None
+    return async_get_roll_traces(hass).get(context.id)
+
+
+@callback
+def async_setup_latency_tracing(hass: HomeAssistant) -> None:
+    """Record when automations started by a traced roll begin their actions."""
+
+    @callback
+    def _automation_triggered(event: Event) -> None:
+        if event.context.parent_id is None:
+            return
+        if trace := async_get_roll_traces(hass).get(event.context.parent_id):
+            trace.mark(STAGE_ACTION_START)
+
+    hass.bus.async_listen(EVENT_AUTOMATION_TRIGGERED, _automation_triggered)
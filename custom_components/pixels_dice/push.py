@@ -0,0 +1,183 @@
+"""Push roll datagrams to local UDP / Unix-domain socket listeners.
+
+Broadcast overlays can read rolls from a socket instead of polling the REST
+API. Every roll-state message is sent, straight from the notification handler,
+as one datagram:
+
+    byte 0      packet version (1)
+    byte 1      roll state code (PixelRollStateValues)
+    byte 2      face, 1-based (0 while not landed)
+    bytes 3-10  time the notification was handled, unix seconds (float64 LE)
+    bytes 11-   die name, UTF-8
+
+The packet lives in a buffer allocated once per die, and datagram transports
+never block: if a socket cannot take the packet it is queued by asyncio or
+dropped, and the event loop moves on.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import struct
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .sensor import PixelsDiceDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+PACKET_VERSION = 1
+PACKET_HEADER = struct.Struct("<BBBd")
+
+SCHEME_UDP = "udp"
+SCHEME_UNIX = "unix"
+
+# Seconds before a target that could not be opened is tried again
+RETRY_INTERVAL = 30.0
+
+
+def parse_push_target(value: str) -> tuple[str, str | tuple[str, int]]:
+    """Parse ``udp://host:port`` or ``unix:///path`` into (scheme, address)."""
+    parts = urlsplit(value.strip())
+    if parts.scheme == SCHEME_UDP and parts.hostname and parts.port:
+        return SCHEME_UDP, (parts.hostname, parts.port)
+    if parts.scheme == SCHEME_UNIX and parts.path:
+        return SCHEME_UNIX, parts.path
+    raise vol.Invalid(f"Invalid push target {value!r}")
+
+
+def parse_push_targets(value: str) -> list[tuple[str, str | tuple[str, int]]]:
+    """Parse a comma separated list of push targets."""
+    return [parse_push_target(target) for target in value.split(",") if target.strip()]
+
+
+class _PushProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that closes its socket when a send fails."""
+
+    def __init__(
+        self, target: str, on_lost: Callable[[asyncio.BaseTransport], None]
+    ) -> None:
+        self._target = target
+        self._on_lost = on_lost
+        self._transport: asyncio.BaseTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def error_received(self, exc: Exception) -> None:
+        # A connected socket keeps failing once its listener went away (e.g.
+        # ECONNREFUSED after an overlay re-binds its Unix socket); closing it
+        # lets the sink open a fresh one
+        _LOGGER.debug("Push target %s: %s", self._target, exc)
+        if self._transport is not None:
+            self._transport.close()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self._transport is not None:
+            self._on_lost(self._transport)
+
+
+class RollPushSink:
+    """Send a die's roll-state messages to local socket listeners."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        pixels_device: PixelsDiceDevice,
+        targets: list[tuple[str, str | tuple[str, int]]],
+    ) -> None:
+        self.hass = hass
+        self._pixels_device = pixels_device
+        self._targets = targets
+        self._transports: dict[int, asyncio.DatagramTransport] = {}
+        self._retry_at: dict[int, float] = {}
+        self._connecting: set[int] = set()
+        name = pixels_device.die_name.encode()
+        self._packet = bytearray(PACKET_HEADER.size + len(name))
+        self._packet[PACKET_HEADER.size :] = name
+        self._view = memoryview(self._packet)
+        self._unsub = None
+        self._stopped = False
+
+    async def async_start(self) -> None:
+        """Open every target and start pushing rolls."""
+        await asyncio.gather(
+            *(self._async_open(index) for index in range(len(self._targets)))
+        )
+        self._unsub = self._pixels_device.register_roll_listener(self._handle_roll)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop pushing and close every socket."""
+        self._stopped = True
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        for transport in list(self._transports.values()):
+            transport.close()
+        self._transports.clear()
+
+    @callback
+    def _handle_roll(
+        self, pixels_device: PixelsDiceDevice, state_code: int, face: int | None
+    ) -> None:
+        """Pack the roll into the shared buffer and send it to every target."""
+        PACKET_HEADER.pack_into(
+            self._packet, 0, PACKET_VERSION, state_code, face or 0, time.time()
+        )
+        for transport in self._transports.values():
+            transport.sendto(self._view)
+        if len(self._transports) < len(self._targets):
+            self._async_retry_missing()
+
+    @callback
+    def _async_retry_missing(self) -> None:
+        """Re-open targets that failed, at most once per RETRY_INTERVAL."""
+        now = time.monotonic()
+        for index in range(len(self._targets)):
+            if (
+                index in self._transports
+                or index in self._connecting
+                or self._retry_at.get(index, 0) > now
+            ):
+                continue
+            self._connecting.add(index)
+            self.hass.async_create_background_task(
+                self._async_open(index), f"pixels_dice push target {index}"
+            )
+
+    @callback
+    def _async_drop(self, index: int, transport: asyncio.BaseTransport) -> None:
+        """Forget a closed transport so the target is opened again."""
+        if self._transports.get(index) is transport:
+            del self._transports[index]
+
+    async def _async_open(self, index: int) -> None:
+        """Open the datagram endpoint of one target."""
+        scheme, address = self._targets[index]
+        self._connecting.add(index)
+        try:
+            transport, _ = await self.hass.loop.create_datagram_endpoint(
+                lambda: _PushProtocol(
+                    str(address), lambda lost: self._async_drop(index, lost)
+                ),
+                remote_addr=address,
+                family=socket.AF_UNIX if scheme == SCHEME_UNIX else 0,
+            )
+        except OSError as err:
+            _LOGGER.warning("Cannot open push target %s: %s", address, err)
+            self._retry_at[index] = time.monotonic() + RETRY_INTERVAL
+        else:
+            if self._stopped:
+                transport.close()
+            else:
+                self._transports[index] = transport
+        finally:
+            self._connecting.discard(index)
@@ -0,0 +1,133 @@
+"""Roll-phase timing for Pixels Dice.
+
+Roll-state transitions are timestamped as they arrive and turned into
+per-roll durations:
+
+* throw duration: handling -> rolling (how long the die was shaken in hand)
+* settle time: rolling -> landed (how long it tumbled before coming to rest)
+* time on face: landed/on face -> handling (how long it rested before the roll)
+
+plus the number of crooked states seen while settling. Running percentiles are
+kept over a fixed-size window per metric.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from .const import (
+    ROLL_STATE_CROOKED,
+    ROLL_STATE_HANDLING,
+    ROLL_STATE_ON_FACE,
+    ROLL_STATE_ROLLED,
+    ROLL_STATE_ROLLING,
+)
+from .latency import compute_percentiles
+
+METRIC_THROW = "throw_ms"
+METRIC_SETTLE = "settle_ms"
+METRIC_TIME_ON_FACE = "time_on_face_ms"
+
+METRICS = (METRIC_THROW, METRIC_SETTLE, METRIC_TIME_ON_FACE)
+
+# Number of samples kept per metric, per die
+DEFAULT_WINDOW = 256
+
+
+class RollTimer:
+    """Track the phases of a die's rolls as they happen."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._samples: dict[str, deque[float]] = {
+            metric: deque(maxlen=window) for metric in METRICS
+        }
+        self._rested_at: float | None = None
+        self._handling_at: float | None = None
+        self._rolling_at: float | None = None
+        self._crooked = 0
+        self.last: dict[str, Any] = dict.fromkeys(METRICS)
+        self.last["crooked"] = 0
+
+    @property
+    def rolling(self) -> bool:
+        """Return True while a roll is in progress."""
+        return self._handling_at is not None or self._rolling_at is not None
+
+    def handle_state(self, state_code: int, now: float) -> dict[str, Any] | None:
+        """Feed a roll-state transition received at ``now`` (monotonic seconds).
+
+        Returns the timings of the roll when ``state_code`` completes one.
+        """
+        if state_code in (ROLL_STATE_HANDLING, ROLL_STATE_ROLLING):
+            if not self.rolling:
+                self._start_roll(now)
+            if state_code == ROLL_STATE_HANDLING:
+                self._handling_at = self._handling_at or now
+            elif self._rolling_at is None:
+                self._rolling_at = now
+        elif state_code == ROLL_STATE_CROOKED:
+            if self.rolling:
+                self._crooked += 1
+        elif state_code == ROLL_STATE_ROLLED:
+            return self._finish_roll(now)
+        elif state_code == ROLL_STATE_ON_FACE:
+            # Put down without a roll: nothing to time, it is resting again
+            if self.rolling or self._rested_at is None:
+                self._reset(now)
+        return None
+
+    def percentiles(self, metric: str) -> dict[str, float | None]:
+        """Return p50/p95/p99 of ``metric`` in milliseconds."""
+        return compute_percentiles(self._samples[metric])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the last roll and a summary of every metric."""
+        return {
+            "last": dict(self.last),
+            **{
+                metric: {"count": len(self._samples[metric]), **self.percentiles(metric)}
+                for metric in METRICS
+            },
+        }
+
+    def _start_roll(self, now: float) -> None:
+        """Begin timing a roll, closing the time the die spent resting."""
+        if self._rested_at is not None:
+            self._record(METRIC_TIME_ON_FACE, now - self._rested_at)
+        self._rested_at = None
+        self._crooked = 0
+
+    def _finish_roll(self, now: float) -> dict[str, Any]:
+        """Compute the timings of the roll that just landed."""
+        throw = settle = None
+        if self._handling_at is not None and self._rolling_at is not None:
+            throw = self._record(METRIC_THROW, self._rolling_at - self._handling_at)
+        if self._rolling_at is not None:
+            settle = self._record(METRIC_SETTLE, now - self._rolling_at)
+        self.last = {
+            METRIC_THROW: throw,
+            METRIC_SETTLE: settle,
+            METRIC_TIME_ON_FACE: self.last[METRIC_TIME_ON_FACE],
+            "crooked": self._crooked,
+        }
+        self._reset(now)
+        return {
+            METRIC_THROW: throw,
+            METRIC_SETTLE: settle,
+            "crooked": self.last["crooked"],
+        }
+
+    def _reset(self, now: float) -> None:
+        """Forget the current roll; the die is now resting."""
+        self._handling_at = None
+        self._rolling_at = None
+        self._crooked = 0
+        self._rested_at = now
+
+    def _record(self, metric: str, seconds: float) -> float:
+        """Store a duration and return it in milliseconds."""
+        elapsed_ms = round(seconds * 1000, 1)
+        self._samples[metric].append(elapsed_ms)
+        if metric == METRIC_TIME_ON_FACE:
+            self.last[METRIC_TIME_ON_FACE] = elapsed_ms
+        return elapsed_ms
@@ -2,8 +2,12 @@ import asyncio
 import inspect
 import logging
 import struct
+import time
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 from enum import IntEnum
+from functools import partial
+from typing import Any
 
 from bleak import BleakClient, BLEDevice
 from homeassistant.components import bluetooth
@@ -19,11 +23,56 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.components.text import TextEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .advertisements import AdvertisementDeduplicator
+from .bulk_transfer import (
+    BULK_DATA_ACK,
+    BULK_SETUP_ACK,
+    TRANSFER_REQUESTS,
+    BulkTransfer,
+    ProgressCallback,
+    chunk_size_for_mtu,
+    compute_data_set_hash,
+)
+from .command_queue import CommandPriority, PixelsCommandQueue
+from .const import (
+    CONF_HUB,
+    CONF_IDENTITY,
+    DATA_HUBS,
+    DOMAIN,
+    EVENT_ROLL,
+    ROLL_STATE_CROOKED,
+    ROLL_STATE_HANDLING,
+    ROLL_STATE_ON_FACE,
+    ROLL_STATE_ROLLED,
+    ROLL_STATE_ROLLING,
+    SIGNAL_DIE_ADDED,
+)
+from .face_actions import FaceActionEngine
+from .identity import LEGACY_I_AM_A_DIE_FORMAT, DieIdentity, decode_i_am_a_die
+from .latency import (
+    STAGE_DECODE,
+    STAGE_DISPATCH,
+    STAGE_STATE_WRITE,
+    STAGES,
+    LatencyTracker,
+    RollTrace,
+    async_open_trace,
+)
+from .roll_timing import (
+    METRIC_SETTLE,
+    METRIC_THROW,
+    METRIC_TIME_ON_FACE,
+    RollTimer,
+)
+from .statistics import RollStatistics
+from .telemetry import TELEMETRY_FORMAT, MotionTelemetry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,9 +82,57 @@ PIXEL_NOTIFY_CHAR_UUID = "6e400001-b5a3-f393-e0a9-e50e24dcca9e"
 BATTERY_LEVEL_CHAR_UUID = "00002a19-0000-1000-8000-00805f9b34fb"
 
 # Pixel-dice message codes (from DieMessages.ts)
+WHO_ARE_YOU      = 0x01  # whoAreYou
+I_AM_A_DIE       = 0x02  # iAmADie
 ROLL_STATE_MESSAGE = 0x03
+TELEMETRY_MESSAGE = 0x04  # telemetry
+REQUEST_TELEMETRY = 0x1A  # requestTelemetry
+BLINK_MESSAGE    = 0x1D  # blink
+BLINK_ACK        = 0x1E  # blinkAck
 REQUEST_BATTERY  = 0x21  # requestBatteryLevel
 BATTERY_MESSAGE  = 0x22  # batteryLevel
+REQUEST_RSSI     = 0x23  # requestRssi
+RSSI_MESSAGE     = 0x24  # rssi
+
+# Roll state names (PixelRollStateValues in DieMessages.ts)
+ROLL_STATE_NAMES = {
+    ROLL_STATE_ROLLED: "rolled",
+    ROLL_STATE_HANDLING: "handling",
+    ROLL_STATE_ROLLING: "rolling",
+    ROLL_STATE_CROOKED: "crooked",
+    ROLL_STATE_ON_FACE: "onFace",
+}
+
+# Minimum payload length (including the type byte) of the messages we decode
+MESSAGE_MIN_LENGTHS = {
+    I_AM_A_DIE: LEGACY_I_AM_A_DIE_FORMAT.size,
+    TELEMETRY_MESSAGE: TELEMETRY_FORMAT.size,
+    ROLL_STATE_MESSAGE: 3,
+    BATTERY_MESSAGE: 3,
+    RSSI_MESSAGE: 2,
+}
+
+# Acknowledgements that only resolve pending commands and transfers
+ACK_MESSAGES = frozenset(
+    {BLINK_ACK, BULK_SETUP_ACK, BULK_DATA_ACK}.union(*TRANSFER_REQUESTS.values())
+)
+
+# Telemetry request modes (from DieMessages.ts)
+TELEMETRY_REQUEST_OFF = 0x00
+TELEMETRY_REQUEST_ONCE = 0x01
+TELEMETRY_REQUEST_AUTOMATIC = 0x02
+
+# Minimum interval between telemetry messages while streaming
+TELEMETRY_INTERVAL_MS = 20
+
+# All LEDs for Blink messages
+ALL_FACES_MASK = 0xFFFFFFFF
+
+# Seconds that dice torn down together get to disconnect
+SHUTDOWN_TIMEOUT = 2.0
+
+type RollListener = Callable[[PixelsDiceDevice, int, int | None], None]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -43,29 +140,100 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Pixels Dice sensor platform."""
-    pixels_device = hass.data[DOMAIN][config_entry.unique_id]
+    if config_entry.data.get(CONF_HUB):
+        hub = hass.data[DATA_HUBS][config_entry.entry_id]
+        hub.async_register_platform(async_add_entities, async_create_entities)
+        return
+
+    result = async_add_entities(
+        async_create_entities(hass.data[DOMAIN][config_entry.unique_id])
+    )
+    if inspect.isawaitable(result):
+        await result
 
-    result = async_add_entities([
+
+def async_create_entities(pixels_device: "PixelsDiceDevice") -> list[SensorEntity]:
+    """Return the sensors of a die."""
+    entities = [
         PixelsDiceStateSensor(pixels_device),
         PixelsDiceFaceSensor(pixels_device),
         PixelsDiceBatteryLevelSensor(pixels_device),
         PixelsDiceBatteryStateSensor(pixels_device),
         PixelsDiceLastSeenSensor(pixels_device),
         PixelsDiceRSSISensor(pixels_device),
-    ])
-    if inspect.isawaitable(result):
-        await result
+        PixelsDiceLatencySensor(pixels_device),
+        PixelsDiceRollTimingSensor(pixels_device, METRIC_THROW, "Throw Duration"),
+        PixelsDiceRollTimingSensor(pixels_device, METRIC_SETTLE, "Settle Time"),
+        PixelsDiceRollTimingSensor(pixels_device, METRIC_TIME_ON_FACE, "Time on Face"),
+    ]
+    if pixels_device.telemetry is not None:
+        entities.append(PixelsDiceMotionSensor(pixels_device))
+    return entities
+
+
+async def async_shutdown_dice(
+    devices: Iterable["PixelsDiceDevice"], timeout: float = SHUTDOWN_TIMEOUT
+) -> None:
+    """Stop and disconnect dice concurrently, abandoning stragglers after ``timeout``.
+
+    Each die's roll statistics are written out under the same deadline.
+    """
+    tasks = [
+        asyncio.create_task(_async_shutdown_die(pixels_device)) for pixels_device in devices
+    ]
+    if not tasks:
+        return
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        _LOGGER.warning(
+            f"{len(pending)} of {len(tasks)} dice did not disconnect within {timeout} s"
+        )
+    for task in done:
+        if err := task.exception():
+            _LOGGER.error(f"Error shutting down die: {err}")
+
+
+async def _async_shutdown_die(pixels_device: "PixelsDiceDevice") -> None:
+    """Write out a die's statistics while disconnecting it."""
+    await asyncio.gather(
+        pixels_device.statistics.async_stop(),
+        pixels_device.async_will_remove_from_hass(),
+    )
 
 
 class PixelsDiceDevice:
     """Manages the Pixels Dice BLE connection and state."""
 
-    def __init__(self, hass: HomeAssistant, die_name: str, unique_id: str, autoconnect: bool) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        die_name: str,
+        unique_id: str,
+        autoconnect: bool,
+        identity: DieIdentity | None = None,
+        telemetry: bool = False,
+    ) -> None:
         self.hass = hass
         self.die_name = die_name
         self.unique_id = unique_id
         self.autoconnect = autoconnect
+        # An identity stored by an older version may fail validation; asking
+        # the die again is cheap
+        self.identity = identity if identity is not None and identity.is_valid else None
+        # The hub managing this die, if it is not a config entry of its own
+        self.hub = None
+        # The face action table run when this die lands, if any
+        self.face_actions: FaceActionEngine | None = None
+        self.data_set_hash: int | None = None
         self._client = None
+        self._ble_device: BLEDevice | None = None
+        self._connect_task: asyncio.Task | None = None
+        self._removed = False
+        self._disconnected_at: float | None = None
+        self.disconnect_count = 0
+        self.last_resume_ms: float | None = None
         self._state = None
         self._face = None
         self._battery_level = None
@@ -73,18 +241,23 @@ class PixelsDiceDevice:
         self._last_seen = None
         self._rssi: int | None = None
         self._listeners = []
+        self._roll_listeners: list[RollListener] = []
+        self._roll_waiters: set[asyncio.Future[dict[str, Any]]] = set()
         self._unsub_bluetooth_tracker = None # To store the unsubscribe callback
+        self.advertisements = AdvertisementDeduplicator()
+        self._commands = PixelsCommandQueue(self._async_write_command)
+        self.latency = LatencyTracker()
+        self.roll_trace: RollTrace | None = None
+        self.statistics = RollStatistics(hass, self)
+        self.roll_timer = RollTimer()
+        # Accelerometer streaming during rolls is opt-in
+        self.telemetry = MotionTelemetry() if telemetry else None
+        self.roll_motion: dict[str, Any] | None = None
+        self._telemetry_task: asyncio.Task | None = None
+        self._bulk_transfer: BulkTransfer | None = None
 
     async def async_added_to_hass(self) -> None:
         """Run when this device has been added to Home Assistant."""
-        # register our BLE‐service callback in ACTIVE mode
-        self._unsub_bluetooth_tracker = bluetooth.async_register_callback(
-            self.hass,
-            self._bluetooth_service_info_callback,
-            bluetooth.BluetoothCallbackMatcher(local_name=self.die_name),
-            BluetoothScanningMode.ACTIVE,
-        )
-
         # If we have already seen the die, mark it present immediately
         try:
             service_info = bluetooth.async_last_service_info(
@@ -98,22 +271,55 @@ class PixelsDiceDevice:
         if service_info:
             self._last_seen = datetime.now(timezone.utc)
 
+        # register our BLE‐service callback in ACTIVE mode; a hub dispatches
+        # to its dice instead
+        if self.hub is None:
+            self._unsub_bluetooth_tracker = bluetooth.async_register_callback(
+                self.hass,
+                self.handle_advertisement,
+                bluetooth.BluetoothCallbackMatcher(local_name=self.die_name),
+                BluetoothScanningMode.ACTIVE,
+            )
+        async_dispatcher_send(self.hass, SIGNAL_DIE_ADDED, self)
+
     async def async_will_remove_from_hass(self) -> None:
-        """Run when this device is being removed from Home Assistant."""
+        """Run when this device is being removed from Home Assistant.
+
+        Stops scanning, cancels a connect in progress and closes the GATT
+        connection, so nothing outlives the config entry.
+        """
+        self._removed = True
         if self._unsub_bluetooth_tracker:
             self._unsub_bluetooth_tracker()
+            self._unsub_bluetooth_tracker = None
+        tasks = [
+            task
+            for task in (self._connect_task, self._telemetry_task)
+            if task is not None and not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            # asyncio.wait neither raises the tasks' errors nor hides our own
+            # cancellation when a shutdown deadline expires
+            await asyncio.wait(tasks)
+        self._connect_task = None
+        if self._client is not None:
+            await self.async_disconnect_die()
 
-    def _bluetooth_service_info_callback(self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange) -> None:
-        """Callback for Bluetooth service info updates."""
+    def handle_advertisement(self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange) -> None:
+        """Handle an advertisement from our callback or the hub's."""
         _LOGGER.debug(f"Bluetooth service info callback for {self.die_name}: {change}")
         if change == BluetoothChange.ADVERTISEMENT:
+            is_new, self._rssi = self.advertisements.accept(service_info)
+            if not is_new:
+                # Same advertisement relayed by another proxy
+                return
             self._last_seen = datetime.now(timezone.utc)
-            # update RSSI from advertisement
-            self._rssi = service_info.rssi
             self._notify_listeners()
 
             if self.autoconnect and not (self._client and self._client.is_connected):
-                asyncio.create_task(self.async_connect_die())
+                self._async_schedule_connect(service_info.device)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -122,7 +328,8 @@ class PixelsDiceDevice:
             identifiers={(DOMAIN, self.unique_id)},
             name=self.die_name,
             manufacturer="Pixels Dice",
-            model="Bluetooth Dice",
+            model=self.identity.model if self.identity else "Bluetooth Dice",
+            sw_version=self.identity.firmware if self.identity else None,
         )
 
     def register_listener(self, listener) -> None:
@@ -134,6 +341,30 @@ class PixelsDiceDevice:
         if listener in self._listeners:
             self._listeners.remove(listener)
 
+    def register_roll_listener(self, listener: RollListener) -> Callable[[], None]:
+        """Register a callback run directly from every roll-state message.
+
+        The callback receives the device, the raw roll-state code and the
+        1-based face (or None). Returns a function that unregisters it.
+        """
+        self._roll_listeners.append(listener)
+
+        def _unregister() -> None:
+            if listener in self._roll_listeners:
+                self._roll_listeners.remove(listener)
+
+        return _unregister
+
+    def async_wait_for_roll(self) -> asyncio.Future[dict[str, Any]]:
+        """Return a future resolved with the face and timings of the next landing.
+
+        Cancel the future to stop waiting.
+        """
+        future: asyncio.Future[dict[str, Any]] = self.hass.loop.create_future()
+        self._roll_waiters.add(future)
+        future.add_done_callback(self._roll_waiters.discard)
+        return future
+
     def _notify_listeners(self) -> None:
         """Notify all registered listeners of a state change."""
         for listener in self._listeners:
@@ -144,17 +375,15 @@ class PixelsDiceDevice:
             else:
                 listener()
 
-    async def async_connect_die(self):
-        """Connect to the Pixels die and start listening for notifications."""
-        _LOGGER.info(f"Attempting to connect to Pixels die named '{self.die_name}'...")
+    async def async_connect_die(self, ble_device: BLEDevice | None = None):
+        """Connect to the Pixels die and start listening for notifications.
 
-        scanner = bluetooth.async_get_scanner(self.hass)
-        device: BLEDevice | None = None
-        for discovered_device in scanner.discovered_devices:
-            if discovered_device.name == self.die_name:
-                device = discovered_device
-                break
+        If ``ble_device`` is given (from an advertisement, or the last known
+        device when resuming after a drop) the scanner lookup is skipped.
+        """
+        _LOGGER.info(f"Attempting to connect to Pixels die named '{self.die_name}'...")
 
+        device = ble_device or self._find_ble_device()
         if device is None:
             _LOGGER.warning(f"Could not find a die named '{self.die_name}'. Make sure it's on and nearby.")
             self._state = "Not Found"
@@ -162,20 +391,26 @@ class PixelsDiceDevice:
             return
 
         _LOGGER.info(f"Found die: {device.name} ({device.address})")
-        self._client = BleakClient(device)
+        self._ble_device = device
+        self._client = BleakClient(device, disconnected_callback=self._handle_disconnect)
 
         try:
             await self._client.connect()
             if self._client.is_connected:
                 _LOGGER.info("Successfully connected to the die.")
-                await self._client.start_notify(PIXEL_NOTIFY_CHAR_UUID, self._handle_roll)
+                await self._client.start_notify(
+                    PIXEL_NOTIFY_CHAR_UUID, partial(self._handle_notify, self._client)
+                )
                 self._state = "Connected"
+                if self._disconnected_at is not None:
+                    self.last_resume_ms = (time.monotonic() - self._disconnected_at) * 1000
+                    self._disconnected_at = None
+                    _LOGGER.info(f"Resumed {self.die_name} in {self.last_resume_ms:.0f} ms")
                 _LOGGER.info("Listening for rolls...")
+                if self.identity is None:
+                    await self._async_identify_once()
                 # Ask the die for its battery percentage
-                await self._client.write_gatt_char(
-                    PIXEL_NOTIFY_CHAR_UUID,
-                    bytes([REQUEST_BATTERY])
-                )
+                await self.async_request_battery()
             else:
                 _LOGGER.error("Failed to connect to the die.")
                 self._state = "Connection Failed"
@@ -185,15 +420,35 @@ class PixelsDiceDevice:
         finally:
             self._notify_listeners()
 
+    def _find_ble_device(self) -> BLEDevice | None:
+        """Look the die up by name among the scanner's discovered devices."""
+        scanner = bluetooth.async_get_scanner(self.hass)
+        for discovered_device in scanner.discovered_devices:
+            if discovered_device.name == self.die_name:
+                return discovered_device
+        return None
+
+    def _async_schedule_connect(self, ble_device: BLEDevice | None = None) -> None:
+        """Start connecting in the background unless a connect is running."""
+        if self._removed or (
+            self._connect_task is not None and not self._connect_task.done()
+        ):
+            return
+        self._connect_task = asyncio.create_task(self.async_connect_die(ble_device))
+
     async def async_disconnect_die(self):
         """Disconnect from the Pixels die."""
         if self._client and self._client.is_connected:
+            # Forget the client first so its disconnected callback is ignored
+            client, self._client = self._client, None
             try:
-                await self._client.stop_notify(PIXEL_NOTIFY_CHAR_UUID)
-                await self._client.disconnect()
+                self._commands.clear(ConnectionError(f"Die {self.die_name} disconnected"))
+                await client.stop_notify(PIXEL_NOTIFY_CHAR_UUID)
+                await client.disconnect()
                 _LOGGER.info(f"Disconnected from {self.die_name}")
                 self._state = "Disconnected"
                 self._face = None
+                self._async_reset_telemetry()
             except Exception as e:
                 _LOGGER.error(f"Error disconnecting from die: {e}")
             finally:
@@ -201,47 +456,340 @@ class PixelsDiceDevice:
         else:
             _LOGGER.info(f"Die {self.die_name} is not connected.")
 
+    def _handle_disconnect(self, client: BleakClient) -> None:
+        """BleakClient callback for a connection the die (or the link) dropped."""
+        if client is not self._client:
+            return  # a client we already replaced or disconnected ourselves
+        self._disconnected_at = time.monotonic()
+        self.disconnect_count += 1
+        _LOGGER.info(f"Die {self.die_name} disconnected unexpectedly")
+
+        # The notify subscription died with the link; dropping the client makes
+        # any late notification from it a no-op.
+        self._client = None
+        self._commands.clear(ConnectionError(f"Die {self.die_name} disconnected"))
+        self._state = "Disconnected"
+        self._face = None
+        self._async_reset_telemetry()
+        self._notify_listeners()
+
+        if self.autoconnect and self._ble_device is not None:
+            self._async_schedule_connect(self._ble_device)
+
+    def _handle_notify(self, client: BleakClient, sender: int, data: bytearray) -> None:
+        """Forward notifications from the current client only."""
+        if client is self._client:
+            self._handle_roll(sender, data)
+
+    async def _async_write_command(self, payload: bytes, response: bool) -> None:
+        """Write a raw message to the die; used by the command queue."""
+        if not (self._client and self._client.is_connected):
+            raise ConnectionError(f"Die {self.die_name} is not connected")
+        await self._client.write_gatt_char(
+            PIXEL_NOTIFY_CHAR_UUID, payload, response=response
+        )
+
+    async def async_send_command(
+        self,
+        payload: bytes,
+        *,
+        priority: CommandPriority = CommandPriority.NORMAL,
+        key: str | None = None,
+        ack_type: int | None = None,
+        response: bool = False,
+    ) -> None:
+        """Send a message to the die through its command queue."""
+        await self._commands.async_send(
+            payload,
+            priority=priority,
+            key=key,
+            ack_type=ack_type,
+            response=response,
+        )
+
+    async def async_identify(self) -> None:
+        """Ask the die who it is and store the answer."""
+        await self.async_send_command(
+            bytes([WHO_ARE_YOU]),
+            priority=CommandPriority.HIGH,
+            key="identity",
+            ack_type=I_AM_A_DIE,
+        )
+        if self.identity is not None:
+            self._async_store_identity()
+
+    async def _async_identify_once(self) -> None:
+        """Identify a die seen for the first time; failure is not fatal."""
+        try:
+            await self.async_identify()
+        except TimeoutError:
+            _LOGGER.warning(f"Die {self.die_name} did not identify itself")
+
+    def _async_store_identity(self) -> None:
+        """Persist the identity in the config entry and the device registry."""
+        identity = self.identity
+        if self.hub is not None:
+            self.hub.async_store_identity(self)
+        elif (
+            entry := self.hass.config_entries.async_entry_for_domain_unique_id(
+                DOMAIN, self.unique_id
+            )
+        ) and entry.data.get(CONF_IDENTITY) != identity.as_dict():
+            self.hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_IDENTITY: identity.as_dict()}
+            )
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, self.unique_id)}
+        ):
+            device_registry.async_update_device(
+                device.id, model=identity.model, sw_version=identity.firmware
+            )
+
+    async def _async_request_telemetry(self, mode: int) -> None:
+        """Start or stop the die's telemetry stream."""
+        try:
+            await self.async_send_command(
+                struct.pack("<BBH", REQUEST_TELEMETRY, mode, TELEMETRY_INTERVAL_MS),
+                priority=CommandPriority.HIGH,
+            )
+        except (ConnectionError, TimeoutError) as err:
+            _LOGGER.debug(f"Could not change telemetry of {self.die_name}: {err}")
+
+    async def async_upload_profile(
+        self, request: bytes, data: bytes, progress: ProgressCallback | None = None
+    ) -> dict[str, Any]:
+        """Upload a data set after the transfer ``request`` describing it.
+
+        Once the die reports the data stored, it is asked who it is and the
+        data set hash it reports must match the uploaded data. Writes go
+        through the command queue, interleaved with other commands.
+        Raises ConnectionError if the die is not connected, TimeoutError if it
+        stops answering and ValueError if it refuses the transfer or reports
+        another hash.
+        """
+        if not (self._client and self._client.is_connected):
+            raise ConnectionError(f"Die {self.die_name} is not connected")
+        if self._bulk_transfer is not None:
+            raise ConnectionError(f"Die {self.die_name} is already transferring")
+        transfer = BulkTransfer(
+            self._async_queue_write,
+            data,
+            chunk_size_for_mtu(getattr(self._client, "mtu_size", None)),
+            request=request,
+            progress=progress,
+        )
+        self._bulk_transfer = transfer
+        try:
+            result = await transfer.async_run()
+        finally:
+            self._bulk_transfer = None
+
+        expected = compute_data_set_hash(data)
+        self.data_set_hash = None
+        await self.async_identify()
+        if self.data_set_hash is None:
+            raise ValueError(f"Die {self.die_name} did not report its data set hash")
+        if self.data_set_hash != expected:
+            raise ValueError(
+                f"Die {self.die_name} reports data set hash "
+                f"{self.data_set_hash:#010x}, expected {expected:#010x}"
+            )
+        return {**result, "data_set_hash": expected}
+
+    async def _async_queue_write(self, payload: bytes, response: bool) -> None:
+        """Write a bulk transfer message through the command queue."""
+        await self._commands.async_send(payload, response=response)
+
+    async def async_request_battery(self) -> None:
+        """Ask the die to report its battery level."""
+        await self.async_send_command(
+            bytes([REQUEST_BATTERY]), priority=CommandPriority.LOW, key="battery"
+        )
+
+    async def async_request_rssi(self) -> None:
+        """Ask the die to report the RSSI it sees once."""
+        await self.async_send_command(
+            struct.pack("<BBH", REQUEST_RSSI, TELEMETRY_REQUEST_ONCE, 0),
+            priority=CommandPriority.LOW,
+            key="rssi",
+        )
+
+    async def async_blink(
+        self,
+        count: int = 1,
+        duration: int = 1000,
+        color: tuple[int, int, int] = (255, 255, 255),
+        fade: float = 0.0,
+        loop_count: int = 1,
+    ) -> None:
+        """Blink the die's LEDs and wait for the die to acknowledge."""
+        red, green, blue = color
+        payload = struct.pack(
+            "<BBHIIBB",
+            BLINK_MESSAGE,
+            count,
+            duration,
+            (red << 16) | (green << 8) | blue,
+            ALL_FACES_MASK,
+            round(fade * 255),
+            loop_count,
+        )
+        await self.async_send_command(
+            payload, priority=CommandPriority.HIGH, ack_type=BLINK_ACK
+        )
+
     def _handle_roll(self, sender: int, data: bytearray):
         """Callback for handling roll notifications from the die."""
-        if not data or len(data) < 3:
+        received = time.monotonic()
+        if not data or len(data) < MESSAGE_MIN_LENGTHS.get(data[0], 1):
             _LOGGER.warning(f"Received invalid data: {data.hex()}")
             return
 
         message_type = data[0]
+        self._handle_ack(data)
 
         if message_type == ROLL_STATE_MESSAGE:  # Roll State Message
-            state_code = data[1]
-            face = data[2]
-
-            if state_code == 0x01:  # State: rolled
-                self._state = f"Landed: {face + 1}"
-                self._face = face + 1
-                _LOGGER.info(f"--- Die landed! Final face is: {face + 1} ---")
-            elif state_code == 0x02:  # State: handling
-                self._state = "Handling"
-                self._face = None
-                _LOGGER.debug("... Handling die ...")
-            elif state_code == 0x03:  # State: rolling
-                self._state = "Rolling"
-                self._face = None
-                _LOGGER.debug("... Rolling ...")
-            elif state_code == 0x04:  # State: crooked
-                self._state = "Crooked"
-                self._face = None
-                _LOGGER.debug("... Crooked ...")
-            elif state_code == 0x05:  # State: onFace
-                self._state = "On Face"
-                self._face = None
-                _LOGGER.debug("... On Face ...")
-            else:
-                self._state = f"Unknown state: {data.hex()}"
-                _LOGGER.warning(f"Received unknown roll state: {data.hex()}")
-            self._notify_listeners()
+            self.roll_trace = self.latency.start_trace(received)
+            async_open_trace(self.hass, self.roll_trace)
+            if self.telemetry is not None:
+                self._update_telemetry_stream(data[1])
+            self._handle_roll_state_notify(sender, data)
+        elif message_type == TELEMETRY_MESSAGE and self.telemetry is not None:
+            self.telemetry.add(data)
+        elif message_type == I_AM_A_DIE:
+            self._handle_identity_notify(data)
         elif message_type == BATTERY_MESSAGE:
             self._handle_battery_notify(sender, data)
-        else:
+        elif message_type == RSSI_MESSAGE:
+            self._handle_rssi_notify(sender, data)
+        elif message_type not in ACK_MESSAGES:
             _LOGGER.debug(f"Received unhandled message type: {data.hex()}")
 
+    def _handle_ack(self, data: bytearray) -> None:
+        """Resolve the command or bulk transfer waiting for this message."""
+        self._commands.handle_message(data[0])
+        if self._bulk_transfer is not None:
+            self._bulk_transfer.handle_message(data)
+
+    def _handle_identity_notify(self, data: bytearray) -> None:
+        """IAmADie handler."""
+        try:
+            self.identity, self.data_set_hash = decode_i_am_a_die(data)
+        except ValueError as err:
+            _LOGGER.warning(f"Ignoring IAmADie from {self.die_name}: {err}")
+            return
+        _LOGGER.info(
+            f"{self.die_name} is a {self.identity.die_type_name} "
+            f"with firmware {self.identity.firmware}"
+        )
+
+    def _handle_roll_state_notify(self, sender: int, data: bytearray):
+        """BLE roll-state notification handler."""
+        state_code = data[1]
+        face = self._face_value(data[2])
+
+        if state_code == ROLL_STATE_ROLLED:
+            self._state = f"Landed: {face}"
+            self._face = face
+            _LOGGER.info(f"--- Die landed! Final face is: {face} ---")
+        elif state_code == ROLL_STATE_HANDLING:
+            self._state = "Handling"
+            self._face = None
+            _LOGGER.debug("... Handling die ...")
+        elif state_code == ROLL_STATE_ROLLING:
+            self._state = "Rolling"
+            self._face = None
+            _LOGGER.debug("... Rolling ...")
+        elif state_code == ROLL_STATE_CROOKED:
+            self._state = "Crooked"
+            self._face = None
+            _LOGGER.debug("... Crooked ...")
+        elif state_code == ROLL_STATE_ON_FACE:
+            self._state = "On Face"
+            self._face = None
+            _LOGGER.debug("... On Face ...")
+        else:
+            self._state = f"Unknown state: {data.hex()}"
+            _LOGGER.warning(f"Received unknown roll state: {data.hex()}")
+        timing = self.roll_timer.handle_state(state_code, self.roll_trace.received)
+        self.roll_trace.mark(STAGE_DECODE)
+        for listener in list(self._roll_listeners):
+            try:
+                listener(self, state_code, self._face)
+            except Exception:
+                # A faulty subscriber must not break roll handling
+                _LOGGER.exception(f"Error in roll listener of {self.die_name}")
+        self.roll_trace.mark(STAGE_DISPATCH)
+        if timing is not None:
+            self._handle_landing(timing)
+        self._notify_listeners()
+
+    def _handle_landing(self, timing: dict[str, Any]) -> None:
+        """Publish a completed roll to waiters and the event bus."""
+        if self.roll_motion is not None:
+            timing = {**timing, "motion": self.roll_motion}
+        self._resolve_roll_waiters(timing)
+        self.hass.bus.async_fire(
+            EVENT_ROLL,
+            {"die": self.unique_id, "face": self._face, **timing},
+            context=self.roll_trace.context,
+        )
+
+    def _update_telemetry_stream(self, state_code: int) -> None:
+        """Stream accelerometer telemetry only while a roll is in progress."""
+        self.roll_motion = None
+        if state_code in (ROLL_STATE_HANDLING, ROLL_STATE_ROLLING):
+            if self.telemetry.active:
+                return
+            self.telemetry.start_roll()
+            mode = TELEMETRY_REQUEST_AUTOMATIC
+        elif state_code in (ROLL_STATE_ROLLED, ROLL_STATE_ON_FACE):
+            if not self.telemetry.active:
+                return
+            motion = self.telemetry.finish_roll()
+            if state_code == ROLL_STATE_ROLLED:
+                self.roll_motion = motion
+            mode = TELEMETRY_REQUEST_OFF
+        else:
+            return
+        self._telemetry_task = asyncio.create_task(self._async_request_telemetry(mode))
+
+    def _async_reset_telemetry(self) -> None:
+        """Forget a telemetry stream that ended with the connection.
+
+        The next roll after reconnecting then asks for the stream again.
+        """
+        if self.telemetry is not None:
+            self.telemetry.abort_roll()
+        self.roll_motion = None
+
+    def _face_value(self, face_index: int) -> int | None:
+        """Map a face index to the value on the face, or None if invalid."""
+        if self.identity is None:
+            return face_index + 1
+        if not self.identity.is_valid_face_index(face_index):
+            _LOGGER.warning(
+                f"{self.die_name} reported face index {face_index}, "
+                f"but a {self.identity.die_type_name} has {self.identity.face_count} faces"
+            )
+            return None
+        return self.identity.face_value(face_index)
+
+    def _resolve_roll_waiters(self, timing: dict[str, Any]) -> None:
+        """Hand the landing to every pending ``async_wait_for_roll`` future."""
+        if not self._roll_waiters:
+            return
+        result = {
+            "die": self.die_name,
+            "unique_id": self.unique_id,
+            "face": self._face,
+            **timing,
+        }
+        for future in list(self._roll_waiters):
+            if not future.done():
+                future.set_result(result)
+
     def _handle_battery_notify(self, sender: int, data: bytearray):
         """BLE battery‐level notification handler."""
         # We only care about the first three bytes here:
@@ -251,6 +799,12 @@ class PixelsDiceDevice:
         _LOGGER.debug("Battery notification: %s%%, %s", level, state)
         self._notify_listeners()
 
+    def _handle_rssi_notify(self, sender: int, data: bytearray):
+        """BLE RSSI notification handler."""
+        (self._rssi,) = struct.unpack_from("<b", data, 1)
+        _LOGGER.debug("RSSI notification: %s dBm", self._rssi)
+        self._notify_listeners()
+
 
 class PixelsDiceEntity:
     """Base class for Pixels Dice entities."""
@@ -277,7 +831,56 @@ class PixelsDiceEntity:
         self._pixels_device.unregister_listener(self)
 
 
-class PixelsDiceStateSensor(PixelsDiceEntity, SensorEntity):
+class PixelsDiceRollEntity(PixelsDiceEntity):
+    """Base class for entities whose state changes with every roll.
+
+    State writes happen under the current roll's trace context, so device
+    triggers and automations can be tied back to the notification.
+    """
+
+    _last_trace: RollTrace | None = None
+
+    async def async_update_ha_state(self, force_refresh: bool = False) -> None:
+        """Write the state under the current roll's trace context."""
+        trace = self._pixels_device.roll_trace
+        if trace is None or trace is self._last_trace:
+            await super().async_update_ha_state(force_refresh)
+            return
+        self._last_trace = trace
+        self.async_set_context(trace.context)
+        await super().async_update_ha_state(force_refresh)
+        trace.mark(STAGE_STATE_WRITE)
+
+
+class PixelsDiceLandingEntity(PixelsDiceEntity):
+    """Base class for entities that only change when a die lands.
+
+    They are written from a roll listener on landing, not on every
+    advertisement, battery or RSSI message, as their attributes are costly.
+    """
+
+    _unsub_roll: Callable[[], None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state whenever the die lands."""
+        self._unsub_roll = self._pixels_device.register_roll_listener(self._handle_roll)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop following the die's rolls."""
+        if self._unsub_roll is not None:
+            self._unsub_roll()
+            self._unsub_roll = None
+
+    @callback
+    def _handle_roll(
+        self, pixels_device: PixelsDiceDevice, state_code: int, face: int | None
+    ) -> None:
+        """Schedule a state write for a landing."""
+        if state_code == ROLL_STATE_ROLLED:
+            self.async_schedule_update_ha_state()
+
+
+class PixelsDiceStateSensor(PixelsDiceRollEntity, SensorEntity):
     """Representation of the Pixels Dice state sensor."""
 
     def __init__(self, pixels_device: PixelsDiceDevice) -> None:
@@ -291,7 +894,7 @@ class PixelsDiceStateSensor(PixelsDiceEntity, SensorEntity):
         return self._pixels_device._state
 
 
-class PixelsDiceFaceSensor(PixelsDiceEntity, SensorEntity):
+class PixelsDiceFaceSensor(PixelsDiceRollEntity, SensorEntity):
     """Representation of the Pixels Dice face sensor."""
 
     def __init__(self, pixels_device: PixelsDiceDevice) -> None:
@@ -304,6 +907,18 @@ class PixelsDiceFaceSensor(PixelsDiceEntity, SensorEntity):
         """Return the state of the sensor."""
         return self._pixels_device._face
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the die type and its range of faces, once known."""
+        identity = self._pixels_device.identity
+        if identity is None or (face_range := identity.face_range) is None:
+            return None
+        return {
+            "die_type": identity.die_type_name,
+            "min_face": face_range[0],
+            "max_face": face_range[1],
+        }
+
 
 class PixelBatteryState(IntEnum):
     ok = 0
@@ -381,3 +996,94 @@ class PixelsDiceRSSISensor(PixelsDiceEntity, SensorEntity):
     def native_value(self) -> int | None:
         """Return the last-seen RSSI value."""
         return self._pixels_device._rssi
+
+
+class PixelsDiceMotionSensor(PixelsDiceEntity, SensorEntity):
+    """Peak acceleration of the last roll, from accelerometer telemetry."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = "g"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({"min_g", "rms_g", "samples"})
+
+    def __init__(self, pixels_device: PixelsDiceDevice) -> None:
+        super().__init__(pixels_device)
+        self._attr_name = f"{pixels_device.die_name} Roll Motion"
+        self._attr_unique_id = f"{pixels_device.unique_id}_roll_motion"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the peak acceleration of the last roll."""
+        last_roll = self._pixels_device.telemetry.last_roll
+        return last_roll["max_g"] if last_roll else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the rest of the last roll's motion summary."""
+        last_roll = self._pixels_device.telemetry.last_roll
+        if not last_roll:
+            return None
+        return {
+            "min_g": last_roll["min_g"],
+            "rms_g": last_roll["rms_g"],
+            "samples": last_roll["samples"],
+        }
+
+
+class PixelsDiceLatencySensor(PixelsDiceLandingEntity, SensorEntity):
+    """Roll latency histogram for Pixels Dice.
+
+    The state is the p95 time from notification receipt to the state write;
+    the attributes hold p50/p95/p99 for every traced stage.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset(STAGES)
+
+    def __init__(self, pixels_device: PixelsDiceDevice) -> None:
+        super().__init__(pixels_device)
+        self._attr_name = f"{pixels_device.die_name} Roll Latency"
+        self._attr_unique_id = f"{pixels_device.unique_id}_roll_latency"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 latency from receipt to state write."""
+        return self._pixels_device.latency.percentiles(STAGE_STATE_WRITE)["p95"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the percentiles of every stage."""
+        return {
+            stage: self._pixels_device.latency.percentiles(stage) for stage in STAGES
+        }
+
+
+class PixelsDiceRollTimingSensor(PixelsDiceLandingEntity, SensorEntity):
+    """Duration of one phase of the die's last roll.
+
+    The attributes hold the running p50/p95/p99 of the same phase.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({"p50", "p95", "p99"})
+
+    def __init__(self, pixels_device: PixelsDiceDevice, metric: str, name: str) -> None:
+        super().__init__(pixels_device)
+        self._metric = metric
+        self._attr_name = f"{pixels_device.die_name} {name}"
+        self._attr_unique_id = f"{pixels_device.unique_id}_{metric.removesuffix('_ms')}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of this phase in the last roll."""
+        return self._pixels_device.roll_timer.last[self._metric]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the running percentiles of this phase."""
+        return self._pixels_device.roll_timer.percentiles(self._metric)
@@ -0,0 +1,249 @@
+"""Services for the Pixels Dice integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import (
+    async_extract_config_entry_ids,
+    async_extract_referenced_entity_ids,
+)
+
+from .bulk_transfer import MAX_BULK_SIZE, async_get_transfer_slots, split_profile
+from .const import CONF_HUB, DOMAIN, EVENT_UPLOAD_PROGRESS
+from .sensor import PixelsDiceDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BLINK = "blink"
+SERVICE_WAIT_FOR_ROLL = "wait_for_roll"
+SERVICE_UPLOAD_PROFILE = "upload_profile"
+
+ATTR_COUNT = "count"
+ATTR_DURATION = "duration"
+ATTR_RGB_COLOR = "rgb_color"
+ATTR_FADE = "fade"
+ATTR_TIMEOUT = "timeout"
+ATTR_MODE = "mode"
+ATTR_PATH = "path"
+
+MODE_ALL = "all"
+MODE_ANY = "any"
+
+BLINK_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_COUNT, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=255)
+        ),
+        vol.Optional(ATTR_DURATION, default=1000): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=65535)
+        ),
+        vol.Optional(ATTR_RGB_COLOR, default=[255, 255, 255]): vol.All(
+            vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 3)
+        ),
+        vol.Optional(ATTR_FADE, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+    }
+)
+
+WAIT_FOR_ROLL_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_TIMEOUT, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=3600)
+        ),
+        vol.Optional(ATTR_MODE, default=MODE_ALL): vol.In((MODE_ALL, MODE_ANY)),
+    }
+)
+
+
+
+UPLOAD_PROFILE_SCHEMA = cv.make_entity_service_schema(
+    {vol.Required(ATTR_PATH): cv.string}
+)
+
+# Progress events are fired every time a transfer passes another step
+PROGRESS_STEP_PERCENT = 10
+
+
+async def async_get_target_devices(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[PixelsDiceDevice]:
+    """Return the dice referenced by a service call's target."""
+    devices = []
+    for entry_id in await async_extract_config_entry_ids(hass, call):
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry.domain != DOMAIN:
+            continue
+        if entry.data.get(CONF_HUB):
+            devices.extend(async_get_targeted_hub_dice(hass, call))
+        elif pixels_device := hass.data.get(DOMAIN, {}).get(entry.unique_id):
+            devices.append(pixels_device)
+    if not devices:
+        raise HomeAssistantError("No Pixels dice found for the service target")
+    return devices
+
+
+@callback
+def async_get_targeted_hub_dice(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[PixelsDiceDevice]:
+    """Return the hub dice whose devices or entities a call targets.
+
+    Hub dice share one config entry, so they are told apart by the device
+    registry identifiers of the targeted devices.
+    """
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_registry = er.async_get(hass)
+    device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        if (entity := entity_registry.async_get(entity_id)) and entity.device_id:
+            device_ids.add(entity.device_id)
+
+    device_registry = dr.async_get(hass)
+    dice = hass.data.get(DOMAIN, {})
+    devices = []
+    for device_id in device_ids:
+        if (device := device_registry.async_get(device_id)) is None:
+            continue
+        for domain, unique_id in device.identifiers:
+            if domain == DOMAIN and unique_id in dice and dice[unique_id].hub:
+                devices.append(dice[unique_id])
+    return devices
+
+
+async def async_read_profile(hass: HomeAssistant, path: str) -> tuple[bytes, bytes]:
+    """Read a profile file from an allowlisted directory.
+
+    Returns the transferAnimationSet message and the data set it describes.
+    """
+    if not hass.config.is_allowed_path(path):
+        raise HomeAssistantError(f"Access to {path} is not allowed")
+    try:
+        data = await hass.async_add_executor_job(Path(path).read_bytes)
+    except OSError as err:
+        raise HomeAssistantError(f"Could not read {path}: {err}") from err
+    if not data or len(data) > MAX_BULK_SIZE:
+        raise HomeAssistantError(f"Profile must be between 1 and {MAX_BULK_SIZE} bytes")
+    try:
+        return split_profile(data)
+    except ValueError as err:
+        raise HomeAssistantError(f"Invalid profile {path}: {err}") from err
+
+
+async def async_upload_die_profile(
+    hass: HomeAssistant, pixels_device: PixelsDiceDevice, request: bytes, data: bytes
+) -> dict[str, Any]:
+    """Upload a profile to one die, firing progress events as it goes."""
+    last_step = -1
+
+    @callback
+    def progress(sent: int, total: int, bytes_per_second: float) -> None:
+        nonlocal last_step
+        step = sent * 100 // total // PROGRESS_STEP_PERCENT
+        if step == last_step:
+            return
+        last_step = step
+        hass.bus.async_fire(
+            EVENT_UPLOAD_PROGRESS,
+            {
+                "die": pixels_device.die_name,
+                "bytes": sent,
+                "total": total,
+                "bytes_per_second": round(bytes_per_second),
+            },
+        )
+
+    source = pixels_device.advertisements.best_source
+    async with async_get_transfer_slots(hass, source):
+        try:
+            result = await pixels_device.async_upload_profile(request, data, progress)
+        except (ConnectionError, TimeoutError, ValueError) as err:
+            raise HomeAssistantError(
+                f"Could not upload to {pixels_device.die_name}: {err}"
+            ) from err
+    return {"die": pixels_device.die_name, **result}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Pixels Dice services."""
+
+    async def async_blink_die(pixels_device: PixelsDiceDevice, call: ServiceCall) -> None:
+        try:
+            await pixels_device.async_blink(
+                count=call.data[ATTR_COUNT],
+                duration=call.data[ATTR_DURATION],
+                color=call.data[ATTR_RGB_COLOR],
+                fade=call.data[ATTR_FADE],
+            )
+        except (ConnectionError, TimeoutError) as err:
+            raise HomeAssistantError(
+                f"Could not blink {pixels_device.die_name}: {err}"
+            ) from err
+
+    async def async_blink(call: ServiceCall) -> None:
+        devices = await async_get_target_devices(hass, call)
+        await asyncio.gather(*(async_blink_die(device, call) for device in devices))
+
+    async def async_wait_for_roll(call: ServiceCall) -> ServiceResponse:
+        devices = await async_get_target_devices(hass, call)
+        wait_any = call.data[ATTR_MODE] == MODE_ANY
+        futures = [pixels_device.async_wait_for_roll() for pixels_device in devices]
+        try:
+            await asyncio.wait(
+                futures,
+                timeout=call.data[ATTR_TIMEOUT],
+                return_when=asyncio.FIRST_COMPLETED if wait_any else asyncio.ALL_COMPLETED,
+            )
+        finally:
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+
+        rolls = [dict(future.result()) for future in futures if not future.cancelled()]
+        return {
+            "rolls": rolls,
+            "total": sum(roll["face"] for roll in rolls if roll["face"] is not None),
+            "timed_out": not rolls if wait_any else len(rolls) < len(futures),
+        }
+
+    async def async_upload_profile(call: ServiceCall) -> ServiceResponse:
+        request, data = await async_read_profile(hass, call.data[ATTR_PATH])
+        devices = await async_get_target_devices(hass, call)
+        uploads = await asyncio.gather(
+            *(
+                async_upload_die_profile(hass, pixels_device, request, data)
+                for pixels_device in devices
+            )
+        )
+        return {"uploads": list(uploads)}
+
+    hass.services.async_register(DOMAIN, SERVICE_BLINK, async_blink, BLINK_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WAIT_FOR_ROLL,
+        async_wait_for_roll,
+        WAIT_FOR_ROLL_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPLOAD_PROFILE,
+        async_upload_profile,
+        UPLOAD_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,166 @@
+"""Hourly long-term statistics of Pixels Dice rolls.
+
+Landings are counted per hour in memory and imported into the recorder in
+batches with ``async_add_external_statistics``, so history graphs of face
+frequencies and roll rates read one compact row per hour instead of every Face
+state change.
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN, ROLL_STATE_ROLLED
+
+if TYPE_CHECKING:
+    from .sensor import PixelsDiceDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = timedelta(minutes=5)
+
+
+class RollStatistics:
+    """Aggregate a die's landings per hour and import them as statistics."""
+
+    def __init__(self, hass: HomeAssistant, pixels_device: PixelsDiceDevice) -> None:
+        self.hass = hass
+        self._pixels_device = pixels_device
+        self._object_id = slugify(pixels_device.unique_id)
+        # hour start -> counts for that hour; key None counts all rolls
+        self._hours: dict[datetime, Counter[int | None]] = {}
+        # statistic_id -> sum at the end of the last hour that was closed
+        self._sums: dict[str, float] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def rolls_statistic_id(self) -> str:
+        """Return the statistic id of the roll count."""
+        return f"{DOMAIN}:{self._object_id}_rolls"
+
+    def face_statistic_id(self, face: int) -> str:
+        """Return the statistic id of a face's count."""
+        return f"{DOMAIN}:{self._object_id}_face_{face}"
+
+    @callback
+    def async_start(self) -> None:
+        """Start counting landings and flushing them periodically."""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded, roll statistics disabled")
+            return
+        self._unsubs.append(
+            self._pixels_device.register_roll_listener(self._handle_roll)
+        )
+        self._unsubs.append(
+            async_track_time_interval(self.hass, self.async_flush, FLUSH_INTERVAL)
+        )
+
+    async def async_stop(self) -> None:
+        """Stop counting and write out whatever is still pending."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        await self.async_flush()
+
+    @callback
+    def _handle_roll(
+        self, pixels_device: PixelsDiceDevice, state_code: int, face: int | None
+    ) -> None:
+        """Count a landing in the current hour's bucket."""
+        if state_code != ROLL_STATE_ROLLED or face is None:
+            return
+        hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        counts = self._hours.setdefault(hour, Counter())
+        counts[None] += 1
+        counts[face] += 1
+
+    async def async_flush(self, _now: datetime | None = None) -> None:
+        """Import every pending hour, closing the hours that have ended."""
+        if not self._hours:
+            return
+        current_hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        rows: dict[str, list[StatisticData]] = {}
+        for hour in sorted(self._hours):
+            counts = self._hours[hour]
+            for key in list(counts):
+                statistic_id = (
+                    self.rolls_statistic_id if key is None else self.face_statistic_id(key)
+                )
+                if statistic_id not in self._sums:
+                    self._sums[statistic_id] = await self._async_last_sum(
+                        statistic_id, hour, counts, key
+                    )
+                count = counts[key]
+                total = self._sums[statistic_id] + count
+                rows.setdefault(statistic_id, []).append(
+                    StatisticData(start=hour, state=count, sum=total)
+                )
+                if hour < current_hour:
+                    self._sums[statistic_id] = total
+
+        for statistic_id, statistics in rows.items():
+            async_add_external_statistics(
+                self.hass, self._metadata(statistic_id), statistics
+            )
+        # The current hour stays in memory; it is re-imported (overwriting its
+        # row) on every flush until it ends.
+        self._hours = {
+            hour: counts for hour, counts in self._hours.items() if hour >= current_hour
+        }
+
+    async def _async_last_sum(
+        self,
+        statistic_id: str,
+        hour: datetime,
+        counts: Counter[int | None],
+        key: int | None,
+    ) -> float:
+        """Return the sum to continue from for ``statistic_id``.
+
+        If the recorder already has a row for ``hour`` (we were restarted mid
+        hour) its count is merged into ``counts`` so the row is not lost.
+        """
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, False, {"state", "sum"}
+        )
+        if not (rows := last.get(statistic_id)):
+            return 0.0
+        row = rows[0]
+        total = row.get("sum") or 0.0
+        if row["start"] >= hour.timestamp():
+            state = row.get("state") or 0.0
+            counts[key] += int(state)
+            return total - state
+        return total
+
+    def _metadata(self, statistic_id: str) -> StatisticMetaData:
+        """Return the metadata of one of the die's statistics."""
+        die_name = self._pixels_device.die_name
+        if statistic_id == self.rolls_statistic_id:
+            name = f"{die_name} Rolls"
+        else:
+            name = f"{die_name} Face {statistic_id.rsplit('_', 1)[1]}"
+        return StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=name,
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=None,
+        )
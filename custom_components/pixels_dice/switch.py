@@ -7,8 +7,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
-from .sensor import PixelsDiceEntity
+from .const import CONF_HUB, DATA_HUBS, DOMAIN
+from .sensor import PixelsDiceDevice, PixelsDiceEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,8 +19,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Pixels Dice switches."""
+    if config_entry.data.get(CONF_HUB):
+        hub = hass.data[DATA_HUBS][config_entry.entry_id]
+        hub.async_register_platform(async_add_entities, async_create_entities)
+        return
+
     pixels_device = hass.data[DOMAIN][config_entry.unique_id]
-    async_add_entities([PixelsDiceAutoconnectSwitch(pixels_device)])
+    async_add_entities(async_create_entities(pixels_device))
+
+
+def async_create_entities(pixels_device: PixelsDiceDevice) -> list[SwitchEntity]:
+    """Return the switches of a die."""
+    return [PixelsDiceAutoconnectSwitch(pixels_device)]
 
 
 class PixelsDiceAutoconnectSwitch(PixelsDiceEntity, SwitchEntity):
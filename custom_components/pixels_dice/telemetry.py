@@ -0,0 +1,134 @@
+"""Accelerometer telemetry of Pixels Dice rolls.
+
+While telemetry is enabled the die streams its acceleration during a roll.
+Readings are queued as raw bytes and decoded a window at a time, then stored
+in fixed-size typed arrays used as ring buffers, and every ``WINDOW_SIZE``
+samples are downsampled into one min/max/RMS window of the acceleration
+magnitude. Only per-roll aggregates survive the roll, so memory per die is
+bounded however long the session runs.
+"""
+from __future__ import annotations
+
+import math
+import struct
+from array import array
+from typing import Any
+
+# Telemetry message (DieMessages.ts): type, then the accelerometer reading
+# in thousandths of g
+TELEMETRY_FORMAT = struct.Struct("<Bhhh")
+# The reading alone, as queued for batch decoding
+SAMPLE_FORMAT = struct.Struct("<hhh")
+
+# Raw samples kept per die
+SAMPLE_CAPACITY = 256
+# Samples per downsampled window
+WINDOW_SIZE = 8
+# Downsampled windows kept per die
+WINDOW_CAPACITY = 64
+
+
+class MotionTelemetry:
+    """Ring buffers of a die's acceleration and per-roll summaries."""
+
+    def __init__(
+        self,
+        capacity: int = SAMPLE_CAPACITY,
+        window_size: int = WINDOW_SIZE,
+        window_capacity: int = WINDOW_CAPACITY,
+    ) -> None:
+        self._capacity = capacity
+        self._window_size = window_size
+        self._window_capacity = window_capacity
+        # Readings not decoded yet; never more than one window's worth
+        self._pending = bytearray()
+        # Acceleration magnitude of each sample, in g
+        self._samples = array("f", bytes(4 * capacity))
+        self._count = 0
+        self._win_min = array("f", bytes(4 * window_capacity))
+        self._win_max = array("f", bytes(4 * window_capacity))
+        self._win_rms = array("f", bytes(4 * window_capacity))
+        self._windows = 0
+        self.active = False
+        self._roll_start = 0
+        self._roll_min = math.inf
+        self._roll_max = 0.0
+        self._roll_sum_sq = 0.0
+        self.last_roll: dict[str, Any] | None = None
+
+    def add(self, data: bytes | bytearray) -> None:
+        """Queue the reading of a telemetry message for decoding."""
+        self._pending += data[1 : TELEMETRY_FORMAT.size]
+        if len(self._pending) >= self._window_size * SAMPLE_FORMAT.size:
+            self._close_window()
+
+    def start_roll(self) -> None:
+        """Start aggregating the samples of a new roll."""
+        self._pending.clear()
+        self._roll_start = self._count
+        self._roll_min = math.inf
+        self._roll_max = 0.0
+        self._roll_sum_sq = 0.0
+        self.active = True
+
+    def finish_roll(self) -> dict[str, Any] | None:
+        """Close the current roll and return its motion summary."""
+        if not self.active:
+            return None
+        if self._pending:
+            self._close_window()
+        self.active = False
+        samples = self._count - self._roll_start
+        if not samples:
+            self.last_roll = None
+            return None
+        self.last_roll = {
+            "samples": samples,
+            "min_g": round(self._roll_min, 3),
+            "max_g": round(self._roll_max, 3),
+            "rms_g": round(math.sqrt(self._roll_sum_sq / samples), 3),
+        }
+        return self.last_roll
+
+    def abort_roll(self) -> None:
+        """Drop the roll in progress, whose stream ended with the connection."""
+        self._pending.clear()
+        self.active = False
+
+    def windows(self) -> list[tuple[float, float, float]]:
+        """Return the retained (min, max, rms) windows, oldest first."""
+        kept = min(self._windows, self._window_capacity)
+        first = self._windows - kept
+        return [
+            (
+                round(self._win_min[i % self._window_capacity], 3),
+                round(self._win_max[i % self._window_capacity], 3),
+                round(self._win_rms[i % self._window_capacity], 3),
+            )
+            for i in range(first, self._windows)
+        ]
+
+    def _close_window(self) -> None:
+        """Decode the queued readings and downsample them into one window."""
+        low = math.inf
+        high = 0.0
+        sum_sq = 0.0
+        samples = 0
+        for acc_x, acc_y, acc_z in SAMPLE_FORMAT.iter_unpack(self._pending):
+            value = math.hypot(acc_x, acc_y, acc_z) / 1000
+            self._samples[self._count % self._capacity] = value
+            self._count += 1
+            samples += 1
+            low = min(low, value)
+            high = max(high, value)
+            sum_sq += value * value
+        self._pending.clear()
+        slot = self._windows % self._window_capacity
+        self._win_min[slot] = low
+        self._win_max[slot] = high
+        self._win_rms[slot] = math.sqrt(sum_sq / samples)
+        self._windows += 1
+        if self.active:
+            self._roll_min = min(self._roll_min, low)
+            self._roll_max = max(self._roll_max, high)
+            self._roll_sum_sq += sum_sq
@@ -0,0 +1,188 @@
+"""WebSocket API for streaming Pixels Dice rolls."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN, ROLL_STATE_ROLLED, SIGNAL_DIE_ADDED
+from .roll_timing import METRIC_SETTLE, METRIC_THROW
+from .sensor import ROLL_STATE_NAMES, PixelsDiceDevice
+
+DEFAULT_BUFFER_SIZE = 32
+MAX_BUFFER_SIZE = 256
+
+# Seconds between two event messages to one subscriber
+FLUSH_INTERVAL = 0.1
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the Pixels Dice WebSocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_rolls)
+
+
+class RollSubscription:
+    """Buffer rolls for one subscriber and send them at most every FLUSH_INTERVAL.
+
+    Home Assistant gives no signal when a connection's outgoing queue has
+    drained, so the subscription paces itself: a burst of rolls waits in the
+    bounded buffer for the next flush, and only the newest ``buffer_size`` of
+    them are sent (the rest are reported as ``dropped``). At most one message
+    per interval reaches the connection's queue however fast dice roll.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_cancelled",
+        "_connection",
+        "_dropped",
+        "_flush_handle",
+        "_hass",
+        "_last_flush",
+        "_msg_id",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        buffer_size: int,
+    ) -> None:
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self._dropped = 0
+        self._flush_handle: asyncio.Handle | None = None
+        self._last_flush = -math.inf
+        self._cancelled = False
+
+    @callback
+    def handle_roll(
+        self, pixels_device: PixelsDiceDevice, state_code: int, face: int | None
+    ) -> None:
+        """Queue a roll for the subscriber."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self._dropped += 1
+        roll = {
+            "die": pixels_device.unique_id,
+            "state": ROLL_STATE_NAMES.get(state_code, "unknown"),
+            "face": face,
+            "time": time.time(),
+        }
+        if state_code == ROLL_STATE_ROLLED:
+            timing = pixels_device.roll_timer.last
+            roll["throw_ms"] = timing[METRIC_THROW]
+            roll["settle_ms"] = timing[METRIC_SETTLE]
+        self._buffer.append(roll)
+        if self._flush_handle is None:
+            loop = self._hass.loop
+            delay = self._last_flush + FLUSH_INTERVAL - loop.time()
+            self._flush_handle = (
+                loop.call_later(delay, self._flush)
+                if delay > 0
+                else loop.call_soon(self._flush)
+            )
+
+    @callback
+    def cancel(self) -> None:
+        """Stop sending rolls to the subscriber."""
+        self._cancelled = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._buffer.clear()
+
+    @callback
+    def _flush(self) -> None:
+        """Send every buffered roll as a single event message."""
+        self._flush_handle = None
+        if self._cancelled or not self._buffer:
+            return
+        self._last_flush = self._hass.loop.time()
+        event: dict[str, Any] = {"rolls": list(self._buffer)}
+        if self._dropped:
+            event["dropped"] = self._dropped
+            self._dropped = 0
+        self._buffer.clear()
+        self._connection.send_message(
+            json_bytes(websocket_api.event_message(self._msg_id, event))
+        )
+
+
+@callback
+def async_die_area(hass: HomeAssistant, pixels_device: PixelsDiceDevice) -> str | None:
+    """Return the area of a die's device, which is the group it belongs to."""
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, pixels_device.unique_id)}
+    )
+    return device.area_id if device else None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "pixels_dice/subscribe_rolls",
+        vol.Optional("dice"): [str],
+        vol.Optional("group"): str,
+        vol.Optional("buffer_size", default=DEFAULT_BUFFER_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_BUFFER_SIZE)
+        ),
+    }
+)
+@callback
+def ws_subscribe_rolls(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream roll-state changes of all dice, or of the listed dice or group.
+
+    Dice set up after the subscription was made are streamed too.
+    """
+    dice = msg.get("dice")
+    group = msg.get("group")
+    subscription = RollSubscription(hass, connection, msg["id"], msg["buffer_size"])
+    unsubs: dict[str, Callable[[], None]] = {}
+
+    @callback
+    def _async_add_die(pixels_device: PixelsDiceDevice) -> None:
+        if dice is not None and not {
+            pixels_device.unique_id,
+            pixels_device.die_name,
+        } & set(dice):
+            return
+        if group is not None and async_die_area(hass, pixels_device) != group:
+            return
+        # A die set up again replaces the listener of its previous instance
+        if unsub := unsubs.pop(pixels_device.unique_id, None):
+            unsub()
+        unsubs[pixels_device.unique_id] = pixels_device.register_roll_listener(
+            subscription.handle_roll
+        )
+
+    for pixels_device in list(hass.data.get(DOMAIN, {}).values()):
+        _async_add_die(pixels_device)
+    unsub_added = async_dispatcher_connect(hass, SIGNAL_DIE_ADDED, _async_add_die)
+
+    @callback
+    def _unsubscribe() -> None:
+        subscription.cancel()
+        unsub_added()
+        for unsub in unsubs.values():
+            unsub()
+        unsubs.clear()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
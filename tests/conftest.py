@@ -1,8 +1,11 @@
+import asyncio
 import sys
 import types
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
+from homeassistant.helpers import device_registry as dr
 
 # Provide stub aiousbwatcher module so Home Assistant usb component can import it
 aiousbwatcher = types.ModuleType("aiousbwatcher")
@@ -43,12 +46,27 @@ class FakeConfigEntries:
         self._entries = []
     async def async_add(self, entry):
         self._entries.append(entry)
+    def async_entry_for_domain_unique_id(self, domain, unique_id):
+        for entry in self._entries:
+            if entry.domain == domain and entry.unique_id == unique_id:
+                return entry
+        return None
+    def async_update_entry(self, entry, *, data):
+        object.__setattr__(entry, "data", data)
+        return True
 
 class FakeHass:
     def __init__(self):
         self.config_entries = FakeConfigEntries()
         self.states = FakeStateMachine()
-        self.data = {}
+        self.bus = MagicMock()
+        self.data = {dr.DATA_REGISTRY: MagicMock()}
+    def verify_event_loop_thread(self, what):
+        pass
+    def async_create_task(self, target, name=None, eager_start=True):
+        return asyncio.get_running_loop().create_task(target, name=name)
+    def async_create_background_task(self, target, name, eager_start=True):
+        return asyncio.get_running_loop().create_task(target, name=name)
 
 @pytest.fixture
 async def hass():
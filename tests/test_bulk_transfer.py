@@ -0,0 +1,222 @@
+import asyncio
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.pixels_dice.bulk_transfer import (
+    BULK_DATA,
+    BULK_SETUP,
+    MAX_PARALLEL_TRANSFERS,
+    TRANSFER_ANIMATION_SET,
+    TRANSFER_REQUESTS,
+    BulkTransfer,
+    async_get_transfer_slots,
+    chunk_size_for_mtu,
+    compute_data_set_hash,
+    split_profile,
+)
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+
+
+class SimulatedBulkDie:
+    """Reassembles bulk transfers and acknowledges them like a die."""
+
+    def __init__(self, notify, ack_delay=0.001, mtu_size=247):
+        self.notify = notify
+        self.ack_delay = ack_delay
+        self.mtu_size = mtu_size
+        self.is_connected = True
+        self.buffer = bytearray()
+        self.writes: list[bytes] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.acking = True
+        self.accepting = True
+        self.received = 0
+        self.finished_type = None
+        self.corrupt = False
+
+    async def write_gatt_char(self, char, data, response=None):
+        data = bytes(data)
+        self.writes.append(data)
+        loop = asyncio.get_running_loop()
+        if data[0] == 0x01:
+            # WhoAreYou: a legacy IAmADie carrying the stored data set's hash
+            reply = struct.pack(
+                "<BBBBIIHIBBBB",
+                0x02, 20, 1, 7, compute_data_set_hash(self.buffer),
+                0, 0, 1704067200, 1, 0, 0, 0,
+            )  # fmt: skip
+            loop.call_soon(self.notify, bytearray(reply))
+        elif data[0] in TRANSFER_REQUESTS:
+            ack_type, self.finished_type = TRANSFER_REQUESTS[data[0]]
+            reply = bytearray([ack_type, int(self.accepting)])
+            loop.call_later(self.ack_delay, self.notify, reply)
+        elif data[0] == BULK_SETUP:
+            (size,) = struct.unpack_from("<H", data, 1)
+            self.buffer = bytearray(size)
+            loop.call_later(self.ack_delay, self.notify, bytearray([0x06]))
+        elif data[0] == BULK_DATA:
+            size, offset = struct.unpack_from("<BH", data, 1)
+            chunk = data[4 : 4 + size]
+            if self.corrupt:
+                chunk = bytes(byte ^ 0xFF for byte in chunk)
+            self.buffer[offset : offset + size] = chunk
+            self.received += size
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.acking:
+                loop.call_later(self.ack_delay, self._ack, offset)
+
+    def _ack(self, offset):
+        self.in_flight -= 1
+        self.notify(bytearray(struct.pack("<BH", 0x08, offset)))
+        if self.finished_type is not None and self.received == len(self.buffer):
+            self.notify(bytearray([self.finished_type]))
+
+
+def test_chunk_size_follows_mtu():
+    """Chunks fill one write at the negotiated MTU, up to the protocol maximum."""
+    assert chunk_size_for_mtu(None) == 16
+    assert chunk_size_for_mtu(23) == 16
+    assert chunk_size_for_mtu(64) == 57
+    assert chunk_size_for_mtu(517) == 100
+
+
+@pytest.mark.asyncio
+async def test_transfer_is_windowed_and_complete():
+    """All chunks arrive, at most ``window`` unacknowledged at a time."""
+    payload = bytes(range(256)) * 20
+    progress = []
+    transfer = None
+    die = SimulatedBulkDie(lambda data: transfer.handle_message(data))
+
+    async def write(data, response):
+        await die.write_gatt_char(None, data, response)
+
+    transfer = BulkTransfer(
+        write,
+        payload,
+        chunk_size_for_mtu(die.mtu_size),
+        window=4,
+        progress=lambda sent, total, rate: progress.append((sent, total, rate)),
+    )
+    result = await transfer.async_run()
+
+    assert bytes(die.buffer) == payload
+    assert die.max_in_flight == 4
+    assert all(len(data) <= die.mtu_size - 3 for data in die.writes)
+    assert result["bytes"] == len(payload)
+    assert result["bytes_per_second"] > 0
+    assert progress[-1][:2] == (len(payload), len(payload))
+
+
+@pytest.mark.asyncio
+async def test_transfer_times_out_without_acks():
+    """A die that stops acknowledging fails the transfer instead of hanging."""
+    transfer = None
+    die = SimulatedBulkDie(lambda data: transfer.handle_message(data))
+    die.acking = False
+
+    async def write(data, response):
+        await die.write_gatt_char(None, data, response)
+
+    transfer = BulkTransfer(write, bytes(500), 100, ack_timeout=0.05)
+    with pytest.raises(TimeoutError):
+        await transfer.async_run()
+
+
+@pytest.mark.asyncio
+async def test_upload_profile_to_several_dice(hass):
+    """Dice accept the transfer request, receive the profile and report it stored."""
+    hass.loop = asyncio.get_running_loop()
+    payload = bytes(range(200)) * 10
+    request = bytes([TRANSFER_ANIMATION_SET, 3, 0])
+    devices = []
+    for index in range(3):
+        device = PixelsDiceDevice(hass, f"Die {index}", f"die_{index}", False)
+        device._client = SimulatedBulkDie(
+            lambda data, device=device: device._handle_roll(0, data), mtu_size=64
+        )
+        devices.append(device)
+
+    with patch.object(
+        devices[0]._commands, "async_send", wraps=devices[0]._commands.async_send
+    ) as queued:
+        results = await asyncio.gather(
+            *(device.async_upload_profile(request, payload) for device in devices)
+        )
+
+    # Every write of the transfer and the check went through the command queue
+    assert queued.call_count == len(devices[0]._client.writes)
+    for device, result in zip(devices, results, strict=True):
+        writes = device._client.writes
+        assert writes[0] == request
+        assert writes[1][0] == BULK_SETUP
+        assert writes[-1] == bytes([0x01])
+        assert bytes(device._client.buffer) == payload
+        assert result["bytes"] == len(payload)
+        assert result["data_set_hash"] == compute_data_set_hash(payload)
+        assert device.data_set_hash == result["data_set_hash"]
+        assert device._bulk_transfer is None
+
+
+@pytest.mark.asyncio
+async def test_upload_profile_hash_mismatch(hass):
+    """A die reporting another data set hash fails the upload."""
+    hass.loop = asyncio.get_running_loop()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    device._client = SimulatedBulkDie(lambda data: device._handle_roll(0, data))
+    device._client.corrupt = True
+
+    with pytest.raises(ValueError, match="data set hash"):
+        await device.async_upload_profile(
+            bytes([TRANSFER_ANIMATION_SET]), bytes(range(200))
+        )
+    assert device._bulk_transfer is None
+
+
+def test_split_profile():
+    """A profile's header must describe exactly the data set that follows."""
+    # 6 byte palette (aligned to 8), 2 RGB keyframes (4), 1 RGB track (8)
+    header = struct.pack("<12HB", 6, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 255)
+    data = bytes(range(20))
+    request, data_set = split_profile(header + data)
+    assert request == bytes([TRANSFER_ANIMATION_SET]) + header
+    assert data_set == data
+
+    with pytest.raises(ValueError, match="describes 20 bytes"):
+        split_profile(header + data[:-1])
+    with pytest.raises(ValueError, match="too short"):
+        split_profile(header)
+
+
+@pytest.mark.asyncio
+async def test_upload_profile_refused(hass):
+    """A die refusing the transfer request gets no bulk data."""
+    hass.loop = asyncio.get_running_loop()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    device._client = SimulatedBulkDie(lambda data: device._handle_roll(0, data))
+    device._client.accepting = False
+
+    with pytest.raises(ValueError):
+        await device.async_upload_profile(bytes([TRANSFER_ANIMATION_SET]), bytes(300))
+    assert len(device._client.writes) == 1
+    assert device._bulk_transfer is None
+
+    with pytest.raises(ValueError):
+        BulkTransfer(device._async_queue_write, bytes(10), 10, request=b"\x42")
+
+
+@pytest.mark.asyncio
+async def test_transfer_slots_are_per_adapter(hass):
+    """Each adapter or proxy limits its own parallel transfers."""
+    slots = async_get_transfer_slots(hass, "hci0")
+    assert async_get_transfer_slots(hass, "hci0") is slots
+    assert async_get_transfer_slots(hass, "proxy") is not slots
+
+    for _ in range(MAX_PARALLEL_TRANSFERS):
+        await slots.acquire()
+    assert slots.locked()
+    assert not async_get_transfer_slots(hass, "proxy").locked()
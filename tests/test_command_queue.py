@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from custom_components.pixels_dice.command_queue import (
+    CommandPriority,
+    PixelsCommandQueue,
+)
+
+
+@pytest.mark.asyncio
+async def test_commands_are_written_by_priority():
+    """Queued commands are written highest priority first."""
+    written = []
+    gate = asyncio.Event()
+
+    async def write(payload, response):
+        await gate.wait()
+        written.append(payload)
+
+    queue = PixelsCommandQueue(write)
+    first = asyncio.create_task(queue.async_send(b"\x01"))
+    await asyncio.sleep(0)
+    low = asyncio.create_task(queue.async_send(b"\x02", priority=CommandPriority.LOW))
+    high = asyncio.create_task(queue.async_send(b"\x03", priority=CommandPriority.HIGH))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(first, low, high)
+
+    assert written == [b"\x01", b"\x03", b"\x02"]
+
+
+@pytest.mark.asyncio
+async def test_high_priority_waits_only_for_the_write_on_the_air():
+    """Writes without response are not drained ahead of a later HIGH command."""
+    written = []
+    gates = [asyncio.Event() for _ in range(5)]
+
+    async def write(payload, response):
+        written.append(payload)
+        await gates[len(written) - 1].wait()
+
+    queue = PixelsCommandQueue(write)
+    sends = [
+        asyncio.create_task(queue.async_send(bytes([i]), priority=CommandPriority.LOW))
+        for i in range(4)
+    ]
+    await asyncio.sleep(0.01)
+    assert written == [b"\x00"]
+    high = asyncio.create_task(queue.async_send(b"\xff", priority=CommandPriority.HIGH))
+    await asyncio.sleep(0.01)
+    for gate in gates:
+        gate.set()
+    await asyncio.gather(*sends, high)
+
+    assert written == [b"\x00", b"\xff", b"\x01", b"\x02", b"\x03"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_requests_are_coalesced():
+    """Two pending requests with the same key produce a single write."""
+    written = []
+    gate = asyncio.Event()
+
+    async def write(payload, response):
+        await gate.wait()
+        written.append(payload)
+
+    queue = PixelsCommandQueue(write)
+    blocker = asyncio.create_task(queue.async_send(b"\x01"))
+    await asyncio.sleep(0)
+    first = asyncio.create_task(queue.async_send(b"\x21", key="battery"))
+    second = asyncio.create_task(queue.async_send(b"\x21", key="battery"))
+    await asyncio.sleep(0)
+    assert queue.pending == 1
+    gate.set()
+    await asyncio.gather(blocker, first, second)
+
+    assert written == [b"\x01", b"\x21"]
+
+
+@pytest.mark.asyncio
+async def test_ack_holds_queue_until_received():
+    """A command expecting an ack blocks later writes until the ack arrives."""
+    written = []
+
+    async def write(payload, response):
+        written.append(payload)
+
+    queue = PixelsCommandQueue(write)
+    blink = asyncio.create_task(queue.async_send(b"\x1d", ack_type=0x1E))
+    other = asyncio.create_task(queue.async_send(b"\x21"))
+    await asyncio.sleep(0.01)
+    assert written == [b"\x1d"]
+
+    assert queue.handle_message(0x1E)
+    await asyncio.gather(blink, other)
+    assert written == [b"\x1d", b"\x21"]
+
+
+@pytest.mark.asyncio
+async def test_ack_timeout_raises():
+    """A die that never acknowledges fails the waiting caller."""
+
+    async def write(payload, response):
+        return None
+
+    queue = PixelsCommandQueue(write, ack_timeout=0.01)
+    with pytest.raises(TimeoutError):
+        await queue.async_send(b"\x1d", ack_type=0x1E)
+
+
+@pytest.mark.asyncio
+async def test_clear_fails_pending_commands():
+    """Clearing the queue fails every waiter with the given error."""
+
+    async def write(payload, response):
+        await asyncio.Event().wait()
+
+    queue = PixelsCommandQueue(write)
+    in_flight = asyncio.create_task(queue.async_send(b"\x01"))
+    queued = asyncio.create_task(queue.async_send(b"\x02"))
+    await asyncio.sleep(0)
+    gone = ConnectionError("gone")
+    queue.clear(gone)
+
+    for task in (in_flight, queued):
+        with pytest.raises(ConnectionError) as err:
+            await task
+        assert err.value is gone
+
+
+@pytest.mark.asyncio
+async def test_senders_block_when_queue_is_full():
+    """Once max_pending commands are waiting, further senders block."""
+    written = []
+    gate = asyncio.Event()
+
+    async def write(payload, response):
+        await gate.wait()
+        written.append(payload)
+
+    queue = PixelsCommandQueue(write, max_pending=2)
+    sends = [
+        asyncio.create_task(queue.async_send(bytes([i]), response=True))
+        for i in range(4)
+    ]
+    await asyncio.sleep(0.01)
+    # One command on the air and one queued; the other senders are held back
+    assert queue.pending == 1
+    assert not any(send.done() for send in sends)
+
+    gate.set()
+    await asyncio.gather(*sends)
+    assert written == [b"\x00", b"\x01", b"\x02", b"\x03"]
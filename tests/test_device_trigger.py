@@ -1,3 +1,4 @@
+import time
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
@@ -8,18 +9,31 @@ from homeassistant.const import (
     CONF_ENTITY_ID,
     CONF_PLATFORM,
 )
+from homeassistant.core import Context
+from homeassistant.helpers import device_registry as dr
 
 from custom_components.pixels_dice import device_trigger
 from custom_components.pixels_dice.const import DOMAIN
+from custom_components.pixels_dice.latency import (
+    STAGE_TRIGGER_MATCH,
+    LatencyTracker,
+    async_open_trace,
+)
 
 
 @pytest.mark.asyncio
 async def test_async_get_triggers(hass):
-    """Device triggers are created for face and state sensors."""
+    """Device triggers are created for the face and state sensors only."""
     entries = [
         SimpleNamespace(domain="sensor", platform=DOMAIN, unique_id="die_face", entity_id="sensor.die_face"),
         SimpleNamespace(domain="sensor", platform=DOMAIN, unique_id="die_state", entity_id="sensor.die_state"),
+        SimpleNamespace(
+            domain="sensor", platform=DOMAIN, unique_id="die_time_on_face", entity_id="sensor.die_time_on_face"
+        ),
     ]
+    hass.data[dr.DATA_REGISTRY].async_get.return_value = SimpleNamespace(
+        identifiers={(DOMAIN, "die")}
+    )
 
     with patch("custom_components.pixels_dice.device_trigger.er.async_get"), patch(
         "custom_components.pixels_dice.device_trigger.er.async_entries_for_device",
@@ -75,8 +89,39 @@ async def test_async_attach_trigger_calls_action(hass):
         data={
             "old_state": SimpleNamespace(state="Rolling"),
             "new_state": SimpleNamespace(state="Landed"),
-        }
+        },
+        context=Context(),
+    )
+    await callbacks[0](event)
+
+    action.assert_awaited_once_with({}, event.context)
+
+
+@pytest.mark.asyncio
+async def test_trigger_records_latency_for_traced_roll(hass):
+    """A state change written under a roll's trace records the trigger stage."""
+    callbacks = []
+
+    def fake_track(hass, entity_ids, callback):
+        callbacks.append(callback)
+        return lambda: None
+
+    tracker = LatencyTracker()
+    trace = tracker.start_trace(time.monotonic())
+    async_open_trace(hass, trace)
+
+    with patch(
+        "custom_components.pixels_dice.device_trigger.async_track_state_change_event",
+        side_effect=fake_track,
+    ):
+        await device_trigger.async_attach_trigger(
+            hass, {CONF_ENTITY_ID: "sensor.die_face"}, AsyncMock(), {}
+        )
+
+    event = SimpleNamespace(
+        data={"old_state": None, "new_state": SimpleNamespace(state="20")},
+        context=trace.context,
     )
     await callbacks[0](event)
 
-    action.assert_awaited_once()
+    assert tracker.as_dict()[STAGE_TRIGGER_MATCH]["count"] == 1
@@ -0,0 +1,131 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import voluptuous as vol
+
+from custom_components.pixels_dice.face_actions import (
+    FaceAction,
+    FaceActionEngine,
+    compile_face_actions,
+    parse_face_actions,
+)
+from custom_components.pixels_dice.latency import STAGE_ACTION_START
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+
+
+def _land(device: PixelsDiceDevice, face_index: int) -> None:
+    device._handle_roll(0, bytearray([0x03, 0x01, face_index]))
+
+
+def test_parse_and_compile_face_actions():
+    """Faces and face ranges compile into a table indexed by face value."""
+    actions = parse_face_actions(
+        "20=scene.turn_on:scene.flash, 1-3=light.turn_on:light.table, 2=script.fumble"
+    )
+    assert actions[0] == FaceAction(20, 20, "scene.turn_on", "scene.flash")
+    assert actions[2] == FaceAction(2, 2, "script.fumble")
+
+    table = compile_face_actions(actions)
+    assert len(table) == 21
+    assert table[0] == ()
+    assert table[2] == (actions[1], actions[2])
+    assert table[20] == (actions[0],)
+    assert parse_face_actions("") == []
+
+    for invalid in ("20", "x=scene.turn_on", "5-2=scene.turn_on", "20=scene", "1=a.b:bad"):
+        with pytest.raises(vol.Invalid):
+            parse_face_actions(invalid)
+
+
+@pytest.mark.asyncio
+async def test_landing_calls_mapped_service(hass):
+    """A landing calls its face's services, parented to the roll's context."""
+    hass.services = AsyncMock()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    engine = FaceActionEngine(hass, parse_face_actions("20=scene.turn_on:scene.flash"))
+    engine.async_attach(device)
+    assert device.face_actions is engine
+
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))  # rolling
+    _land(device, 4)
+    await asyncio.sleep(0)
+    hass.services.async_call.assert_not_called()
+
+    _land(device, 19)
+    # Marked when the call starts, not when it is scheduled
+    assert STAGE_ACTION_START not in device.roll_trace.recorded
+    await asyncio.sleep(0)
+    hass.services.async_call.assert_called_once()
+    args, kwargs = hass.services.async_call.call_args
+    assert args == ("scene", "turn_on", {"entity_id": "scene.flash"})
+    assert kwargs["context"].parent_id == device.roll_trace.context.id
+    assert STAGE_ACTION_START in device.roll_trace.recorded
+
+    engine.async_detach(device)
+    assert device.face_actions is None
+    _land(device, 19)
+    await asyncio.sleep(0)
+    assert engine.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_calls_are_rate_limited_per_target(hass):
+    """Each target gets one call per interval and one call in flight."""
+    release = asyncio.Event()
+
+    async def slow_call(*args, **kwargs):
+        await release.wait()
+
+    hass.services = AsyncMock()
+    hass.services.async_call.side_effect = slow_call
+    dice = [PixelsDiceDevice(hass, f"Die {i}", f"die_{i}", False) for i in range(2)]
+    engine = FaceActionEngine(
+        hass,
+        parse_face_actions("20=scene.turn_on:scene.flash, 20=light.toggle:light.table"),
+        min_interval=0,
+    )
+    for device in dice:
+        engine.async_attach(device)
+
+    # Both dice land on 20 while the first calls are still running
+    _land(dice[0], 19)
+    _land(dice[1], 19)
+    await asyncio.sleep(0)
+    assert hass.services.async_call.call_count == 2
+    assert engine.throttled == 2
+
+    release.set()
+    await asyncio.sleep(0)
+    _land(dice[1], 19)
+    await asyncio.sleep(0)
+    assert hass.services.async_call.call_count == 4
+
+    interval = FaceActionEngine(hass, parse_face_actions("1=script.fumble"), min_interval=60)
+    interval.async_attach(dice[0])
+    _land(dice[0], 0)
+    await asyncio.sleep(0)
+    _land(dice[0], 0)
+    await asyncio.sleep(0)
+    assert interval.as_dict() == {"calls": 1, "throttled": 1, "errors": 0}
+
+    engine.async_stop()
+    interval.async_stop()
+    assert all(device.face_actions is None for device in dice)
+
+
+@pytest.mark.asyncio
+async def test_failing_call_releases_target(hass):
+    """A failing service is counted and does not block later calls."""
+    hass.services = AsyncMock()
+    hass.services.async_call.side_effect = RuntimeError("boom")
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    engine = FaceActionEngine(hass, parse_face_actions("1-20=script.roll"), min_interval=0)
+    engine.async_attach(device)
+
+    _land(device, 0)
+    await asyncio.sleep(0)
+    _land(device, 5)
+    await asyncio.sleep(0)
+
+    assert engine.as_dict() == {"calls": 2, "throttled": 0, "errors": 2}
@@ -0,0 +1,163 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+)
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.pixels_dice import sensor, switch
+from custom_components.pixels_dice.const import (
+    CONF_DICE,
+    CONF_HUB,
+    CONF_PUSH_TARGETS,
+    CONF_TELEMETRY,
+    DOMAIN,
+)
+from custom_components.pixels_dice.hub import HubDie, PixelsDiceHub, parse_dice
+from custom_components.pixels_dice.sensor import PIXEL_SERVICE_UUID
+
+
+@pytest.fixture
+def register_callback():
+    """Patch out Bluetooth and return the callback registration mock."""
+    with patch(
+        "custom_components.pixels_dice.sensor.bluetooth.async_register_callback"
+    ) as register_callback, patch(
+        "custom_components.pixels_dice.sensor.bluetooth.async_last_service_info",
+        return_value=None,
+    ):
+        yield register_callback
+
+
+@pytest.fixture
+async def hub(hass, register_callback):
+    """Return a hub entry manager for two dice."""
+    hass.loop = asyncio.get_running_loop()
+    hass.config = MagicMock(components=set())
+    hass.data[DOMAIN] = {}
+    entry = MagicMock(
+        entry_id="hub_entry",
+        data={CONF_HUB: True},
+        options={CONF_DICE: ["Die A", "Die B"]},
+    )
+    return PixelsDiceHub(hass, entry)
+
+
+def test_parse_dice():
+    """Die names are split on commas, trimmed and deduplicated."""
+    assert parse_dice(" Die A, Die B,,Die A ") == ["Die A", "Die B"]
+
+
+def test_die_records_are_slotted():
+    """Per-die records carry no instance dict."""
+    assert not hasattr(HubDie(MagicMock()), "__dict__")
+
+
+@pytest.mark.asyncio
+async def test_hub_adds_and_removes_dice_at_runtime(hass, hub):
+    """Dice are added and removed with their entities, without a reload."""
+    await hub.async_setup()
+    assert set(hub.dice) == {"Die A", "Die B"}
+    assert hass.data[DOMAIN]["Die A"].hub is hub
+
+    add_sensors = MagicMock()
+    add_switches = MagicMock()
+    hub.async_register_platform(add_sensors, sensor.async_create_entities)
+    hub.async_register_platform(add_switches, switch.async_create_entities)
+    assert add_sensors.call_count == 2
+    assert add_switches.call_count == 2
+
+    with patch(
+        "homeassistant.helpers.entity.Entity.async_remove", AsyncMock()
+    ) as mock_remove:
+        await hub.async_update_dice(["Die A", "Die C"])
+    # Die B's sensors and switch
+    assert mock_remove.call_count == len(sensor.async_create_entities(hub.dice["Die A"])) + 1
+    assert set(hub.dice) == {"Die A", "Die C"}
+    assert "Die B" not in hass.data[DOMAIN]
+    added = add_sensors.call_args.args[0]
+    assert {entity.unique_id for entity in added} >= {"Die C_state", "Die C_face"}
+    hass.data[dr.DATA_REGISTRY].async_update_device.assert_called_once()
+    assert (
+        hass.data[dr.DATA_REGISTRY].async_update_device.call_args.kwargs[
+            "remove_config_entry_id"
+        ]
+        == "hub_entry"
+    )
+
+    await hub.async_unload()
+    assert hub.dice == {}
+    assert hass.data[DOMAIN] == {}
+
+
+@pytest.mark.asyncio
+async def test_hub_stores_identities(hass, hub):
+    """Identities learned by hub dice are kept in the hub entry."""
+    from custom_components.pixels_dice.identity import DieIdentity
+
+    hass.config_entries.async_update_entry = MagicMock()
+    await hub.async_setup()
+    device = hub.dice["Die A"]
+    device.identity = DieIdentity(7, 20, 1, 0x1234, 1704067200)
+
+    device._async_store_identity()
+
+    data = hass.config_entries.async_update_entry.call_args.kwargs["data"]
+    assert data["identities"]["Die A"]["die_type"] == 7
+
+
+@pytest.mark.asyncio
+async def test_hub_dispatches_advertisements_by_name(hass, hub, register_callback):
+    """One callback serves every die of the hub, picked by local name."""
+    await hub.async_setup()
+    register_callback.assert_called_once()
+    handle = register_callback.call_args.args[1]
+    assert register_callback.call_args.args[2] == BluetoothCallbackMatcher(
+        service_uuid=PIXEL_SERVICE_UUID, connectable=True
+    )
+    assert register_callback.call_args.args[3] is BluetoothScanningMode.ACTIVE
+
+    service_info = MagicMock(rssi=-60)
+    service_info.name = "Die A"
+    handle(service_info, BluetoothChange.ADVERTISEMENT)
+    stranger = MagicMock(rssi=-60)
+    stranger.name = "Not a hub die"
+    handle(stranger, BluetoothChange.ADVERTISEMENT)
+    assert hub.dice["Die A"]._last_seen is not None
+    assert hub.dice["Die B"]._last_seen is None
+
+    # Adding a die needs no new registration
+    await hub.async_update_dice(["Die A", "Die B", "Die C"])
+    service_info.name = "Die C"
+    handle(service_info, BluetoothChange.ADVERTISEMENT)
+    assert hub.dice["Die C"]._last_seen is not None
+    register_callback.assert_called_once()
+
+    await hub.async_unload()
+    register_callback.return_value.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_hub_dice_get_push_and_telemetry(hass, hub):
+    """The hub's push targets and telemetry option apply to each of its dice."""
+    hub.entry.options = {
+        CONF_DICE: ["Die A", "Die B"],
+        CONF_PUSH_TARGETS: "udp://127.0.0.1:9999",
+        CONF_TELEMETRY: True,
+    }
+    hub = PixelsDiceHub(hass, hub.entry)
+    with patch(
+        "custom_components.pixels_dice.hub.RollPushSink.async_start", AsyncMock()
+    ), patch("custom_components.pixels_dice.hub.RollPushSink.async_stop") as stop:
+        await hub.async_setup()
+        assert all(device.telemetry is not None for device in hub.dice.values())
+        assert all(die.push_sink is not None for die in hub._dice.values())
+
+        await hub.async_update_dice(["Die A"])
+        assert stop.call_count == 1
+        await hub.async_unload()
+        assert stop.call_count == 2
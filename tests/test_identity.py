@@ -0,0 +1,85 @@
+import struct
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.pixels_dice.const import DOMAIN
+from custom_components.pixels_dice.identity import DieIdentity, decode_i_am_a_die
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+
+BUILT = 1704067200  # 2024-01-01
+
+
+def chunked_i_am_a_die(die_type=7, led_count=20, design="", name="Brian PD20"):
+    """Build an IAmADie message in the chunked layout of current firmware."""
+
+    def chunk(payload):
+        return bytes([len(payload) + 1]) + payload
+
+    return bytearray(
+        bytes([0x02])
+        + chunk(struct.pack("<HIHHHH", 0x0100, BUILT, 0x0100, 0x0100, 0, 0))
+        + chunk(struct.pack("<IBBBBB", 0x1234, 1, die_type, led_count, 1, 0))
+        + chunk(design.encode() + b"\0")
+        + chunk(name.encode() + b"\0")
+        + chunk(struct.pack("<III", 0xCAFEF00D, 4096, 8192))
+        + chunk(struct.pack("<BBBB", 80, 0, 1, 19))
+    )
+
+
+def test_chunked_message_is_decoded():
+    """Current firmware's chunked IAmADie yields the same identity fields."""
+    identity, data_hash = decode_i_am_a_die(chunked_i_am_a_die())
+
+    assert identity == DieIdentity(7, 20, 1, 0x1234, BUILT)
+    assert data_hash == 0xCAFEF00D
+    assert identity.model == "Pixels d20 (onyxBlack)"
+    # Longer names only move the later chunks
+    long_name = chunked_i_am_a_die(name="A much longer die name")
+    assert decode_i_am_a_die(long_name) == (identity, 0xCAFEF00D)
+
+
+def test_legacy_message_is_decoded():
+    """The fixed 22-byte layout of older firmware still works."""
+    message = struct.pack(
+        "<BBBBIIHIBBBB", 0x02, 6, 2, 2, 0xABCD, 0x42, 0, BUILT, 5, 3, 90, 0
+    )
+    identity, data_hash = decode_i_am_a_die(message)
+    assert identity == DieIdentity(2, 6, 2, 0x42, BUILT)
+    assert data_hash == 0xABCD
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        chunked_i_am_a_die()[:30],  # truncated
+        bytearray([0x02, 0x00]) + bytes(40),  # zero-sized chunk
+        chunked_i_am_a_die(die_type=0, led_count=0),  # no such die
+        bytearray([0x02]) + bytes(30),
+    ],
+)
+def test_invalid_messages_are_rejected(message):
+    """Garbage and implausible identities raise instead of decoding."""
+    with pytest.raises(ValueError):
+        decode_i_am_a_die(message)
+
+
+@pytest.mark.asyncio
+async def test_invalid_identity_is_never_stored(hass):
+    """A die whose answer fails validation is not remembered as identified."""
+    entry = MagicMock(domain=DOMAIN, unique_id="test_die", data={"name": "Test Die"})
+    await hass.config_entries.async_add(entry)
+    device = PixelsDiceDevice(hass, "Test Die", "test_die", False)
+
+    device._handle_roll(0, chunked_i_am_a_die()[:30])
+    assert device.identity is None
+
+    device._handle_roll(0, chunked_i_am_a_die())
+    assert device.identity.die_type_name == "d20"
+    assert device.data_set_hash == 0xCAFEF00D
+
+    # A garbage identity stored by an older version triggers a new handshake
+    restored = PixelsDiceDevice(
+        hass, "Test Die", "test_die", False, DieIdentity(93, 211, 7, 0, 0)
+    )
+    assert restored.identity is None
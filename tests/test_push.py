@@ -0,0 +1,148 @@
+import asyncio
+import os
+import socket
+import struct
+import tempfile
+import time
+
+import pytest
+import pytest_socket
+import voluptuous as vol
+
+from custom_components.pixels_dice.push import (
+    PACKET_HEADER,
+    RollPushSink,
+    parse_push_targets,
+)
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+
+
+class _Receiver(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.packets = asyncio.Queue()
+
+    def datagram_received(self, data, addr):
+        self.packets.put_nowait((time.time(), data))
+
+
+def test_parse_push_targets():
+    """UDP and Unix socket targets are parsed, anything else is rejected."""
+    assert parse_push_targets("udp://127.0.0.1:9999, unix:///tmp/dice.sock") == [
+        ("udp", ("127.0.0.1", 9999)),
+        ("unix", "/tmp/dice.sock"),
+    ]
+    assert parse_push_targets("") == []
+    with pytest.raises(vol.Invalid):
+        parse_push_targets("http://127.0.0.1:80")
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.asyncio
+async def test_udp_loopback_delivery(hass):
+    """Rolls reach a local UDP listener straight from the notification handler."""
+    loop = asyncio.get_running_loop()
+    hass.loop = loop
+    receiver = _Receiver()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: receiver, local_addr=("127.0.0.1", 0)
+    )
+    port = transport.get_extra_info("sockname")[1]
+
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    sink = RollPushSink(hass, device, parse_push_targets(f"udp://127.0.0.1:{port}"))
+    await sink.async_start()
+    try:
+        latencies = []
+        for face in range(20):
+            sent = time.time()
+            device._handle_roll(0, bytearray([0x03, 0x01, face]))
+            received, data = await asyncio.wait_for(receiver.packets.get(), 1)
+            latencies.append(received - sent)
+            version, state, packet_face, _ = PACKET_HEADER.unpack_from(data)
+            assert (version, state, packet_face) == (1, 0x01, face + 1)
+            assert data[PACKET_HEADER.size :] == b"Test Die"
+    finally:
+        sink.async_stop()
+        transport.close()
+
+    latencies.sort()
+    # Median loopback delivery, including a round through the event loop
+    assert latencies[len(latencies) // 2] < 0.05
+
+
+@pytest.fixture
+def unix_socket_enabled(socket_enabled):
+    """Allow connecting Unix sockets for one test, then restore the guard."""
+    socket_class = socket.socket
+    connect = socket_class.connect
+    pytest_socket.socket_allow_hosts(["127.0.0.1"], allow_unix_socket=True)
+    yield
+    socket_class.connect = connect
+
+
+@pytest.mark.usefixtures("unix_socket_enabled")
+@pytest.mark.asyncio
+async def test_unix_socket_delivery(hass):
+    """Rolls reach a Unix datagram socket listener."""
+    hass.loop = asyncio.get_running_loop()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dice.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        server.bind(path)
+        server.setblocking(False)
+
+        device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+        sink = RollPushSink(hass, device, parse_push_targets(f"unix://{path}"))
+        await sink.async_start()
+        try:
+            device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))
+            data = await asyncio.wait_for(hass.loop.sock_recv(server, 64), 1)
+        finally:
+            sink.async_stop()
+            server.close()
+
+    assert struct.unpack_from("<BBB", data) == (1, 0x03, 0)
+
+
+@pytest.mark.usefixtures("unix_socket_enabled")
+@pytest.mark.asyncio
+async def test_unix_socket_listener_restart(hass):
+    """A target whose listener re-binds its socket is reopened after a send error."""
+    hass.loop = asyncio.get_running_loop()
+
+    def listen(path):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        server.bind(path)
+        server.setblocking(False)
+        return server
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dice.sock")
+        server = listen(path)
+        device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+        sink = RollPushSink(hass, device, parse_push_targets(f"unix://{path}"))
+        await sink.async_start()
+        try:
+            device._handle_roll(0, bytearray([0x03, 0x01, 0x00]))
+            await asyncio.wait_for(hass.loop.sock_recv(server, 64), 1)
+
+            # The overlay restarts and binds the same path again
+            server.close()
+            os.unlink(path)
+            server = listen(path)
+
+            # The first send fails on the stale socket and closes it
+            device._handle_roll(0, bytearray([0x03, 0x01, 0x01]))
+            await asyncio.sleep(0)
+            assert sink._transports == {}
+            # The next roll reopens the target
+            device._handle_roll(0, bytearray([0x03, 0x01, 0x02]))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            device._handle_roll(0, bytearray([0x03, 0x01, 0x03]))
+            data = await asyncio.wait_for(hass.loop.sock_recv(server, 64), 1)
+        finally:
+            sink.async_stop()
+            server.close()
+
+    assert struct.unpack_from("<BBB", data) == (1, 0x01, 4)
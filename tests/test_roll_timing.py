@@ -0,0 +1,61 @@
+from custom_components.pixels_dice.const import (
+    EVENT_ROLL,
+    ROLL_STATE_CROOKED,
+    ROLL_STATE_HANDLING,
+    ROLL_STATE_ON_FACE,
+    ROLL_STATE_ROLLED,
+    ROLL_STATE_ROLLING,
+)
+from custom_components.pixels_dice.roll_timing import (
+    METRIC_SETTLE,
+    METRIC_THROW,
+    METRIC_TIME_ON_FACE,
+    RollTimer,
+)
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+
+
+def test_roll_phases_are_timed():
+    """Throw, settle and time on face are computed from state transitions."""
+    timer = RollTimer()
+
+    assert timer.handle_state(ROLL_STATE_ON_FACE, 10.0) is None
+    assert timer.handle_state(ROLL_STATE_HANDLING, 12.0) is None
+    assert timer.handle_state(ROLL_STATE_ROLLING, 12.5) is None
+    assert timer.handle_state(ROLL_STATE_CROOKED, 13.0) is None
+    assert timer.handle_state(ROLL_STATE_ROLLING, 13.2) is None
+    timing = timer.handle_state(ROLL_STATE_ROLLED, 14.0)
+
+    assert timing == {METRIC_THROW: 500.0, METRIC_SETTLE: 1500.0, "crooked": 1}
+    assert timer.last[METRIC_TIME_ON_FACE] == 2000.0
+    assert timer.percentiles(METRIC_SETTLE) == {"p50": 1500.0, "p95": 1500.0, "p99": 1500.0}
+
+
+def test_put_down_without_roll_is_not_timed():
+    """Handling that ends on a face without rolling records no throw or settle."""
+    timer = RollTimer()
+
+    timer.handle_state(ROLL_STATE_HANDLING, 1.0)
+    timer.handle_state(ROLL_STATE_ON_FACE, 2.0)
+    timer.handle_state(ROLL_STATE_ROLLING, 5.0)
+    timing = timer.handle_state(ROLL_STATE_ROLLED, 5.25)
+
+    assert timing == {METRIC_THROW: None, METRIC_SETTLE: 250.0, "crooked": 0}
+    assert timer.last[METRIC_TIME_ON_FACE] == 3000.0
+    assert timer.as_dict()[METRIC_THROW]["count"] == 0
+
+
+def test_landing_fires_roll_event_with_timings(hass):
+    """The device fires a roll event carrying the face and the roll timings."""
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+
+    device._handle_roll(0, bytearray([0x03, ROLL_STATE_ROLLING, 0x00]))
+    device._handle_roll(0, bytearray([0x03, ROLL_STATE_ROLLED, 0x13]))
+
+    hass.bus.async_fire.assert_called_once()
+    event_type, data = hass.bus.async_fire.call_args.args
+    assert event_type == EVENT_ROLL
+    assert data["die"] == "test_die_unique_id"
+    assert data["face"] == 20
+    assert data[METRIC_SETTLE] is not None
+    assert data["crooked"] == 0
@@ -1,8 +1,11 @@
+import asyncio
+import struct
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 
 from custom_components.pixels_dice.const import DOMAIN
 from custom_components.pixels_dice.sensor import PixelsDiceDevice, async_setup_entry
@@ -20,6 +23,7 @@ def mock_pixels_dice_device():
     mock_device._battery_level = None
     mock_device._battery_state = None
     mock_device._last_seen = None
+    mock_device.telemetry = None
     mock_device.async_connect_die = AsyncMock(side_effect=lambda: setattr(mock_device, '_state', 'Connected'))
     mock_device.async_disconnect_die = AsyncMock(side_effect=lambda: setattr(mock_device, '_state', 'Disconnected'))
     mock_device.async_read_battery_level = AsyncMock()
@@ -181,3 +185,363 @@ def test_rssi_sensor_native_value(mock_pixels_dice_device):
     # And it should use the correct device class and unit
     assert sensor._attr_device_class == SensorDeviceClass.SIGNAL_STRENGTH
     assert sensor._attr_native_unit_of_measurement == "dBm"
+
+
+def test_roll_records_latency_stages(hass: HomeAssistant):
+    """A roll-state notification is traced from receipt through dispatch."""
+    from custom_components.pixels_dice.latency import STAGE_DECODE, STAGE_DISPATCH
+    from custom_components.pixels_dice.sensor import PixelsDiceLatencySensor
+
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    device._handle_roll(0, bytearray([0x03, 0x01, 0x05]))
+
+    assert device.roll_trace is not None
+    summary = device.latency.as_dict()
+    assert summary[STAGE_DECODE]["count"] == 1
+    assert summary[STAGE_DISPATCH]["count"] == 1
+    assert summary[STAGE_DISPATCH]["p99"] >= summary[STAGE_DECODE]["p50"]
+
+    sensor = PixelsDiceLatencySensor(device)
+    assert sensor.native_value is None
+    assert sensor.extra_state_attributes[STAGE_DECODE]["p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_roll_statistics_sensors_write_only_on_landing(hass: HomeAssistant):
+    """Latency and roll timing sensors ignore advertisements and other messages."""
+    from custom_components.pixels_dice.roll_timing import METRIC_SETTLE
+    from custom_components.pixels_dice.sensor import (
+        PixelsDiceLatencySensor,
+        PixelsDiceRollTimingSensor,
+    )
+
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    sensors = [
+        PixelsDiceLatencySensor(device),
+        PixelsDiceRollTimingSensor(device, METRIC_SETTLE, "Settle Time"),
+    ]
+    for sensor in sensors:
+        sensor.async_schedule_update_ha_state = MagicMock()
+        sensor.schedule_update_ha_state = MagicMock()
+        await sensor.async_added_to_hass()
+
+    device._handle_roll(0, bytearray([0x22, 80, 0x00]))  # battery
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))  # rolling
+    device._notify_listeners()
+    for sensor in sensors:
+        sensor.async_schedule_update_ha_state.assert_not_called()
+        sensor.schedule_update_ha_state.assert_not_called()
+
+    device._handle_roll(0, bytearray([0x03, 0x01, 0x05]))  # landed
+    for sensor in sensors:
+        sensor.async_schedule_update_ha_state.assert_called_once()
+        await sensor.async_will_remove_from_hass()
+    assert device._roll_listeners == []
+
+
+@pytest.mark.asyncio
+async def test_advertisement_callback_registered_once(hass: HomeAssistant):
+    """The callback stays registered across connects and dropped links."""
+    from homeassistant.components.bluetooth import BluetoothChange
+
+    hass.loop = asyncio.get_running_loop()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    listener = MagicMock(spec=[])
+    device.register_listener(listener)
+
+    with patch(
+        "custom_components.pixels_dice.sensor.bluetooth.async_register_callback"
+    ) as register_callback, patch(
+        "custom_components.pixels_dice.sensor.bluetooth.async_last_service_info",
+        return_value=None,
+    ):
+        await device.async_added_to_hass()
+        device.handle_advertisement(
+            MagicMock(rssi=-60, manufacturer_data={}, service_data={}),
+            BluetoothChange.ADVERTISEMENT,
+        )
+        device._client = client = MagicMock(is_connected=True)
+        device._handle_disconnect(client)
+        await asyncio.sleep(0)
+
+    register_callback.assert_called_once()
+    assert listener.call_count == 2
+    await device.async_will_remove_from_hass()
+    register_callback.return_value.assert_called_once()
+
+
+def test_proxied_advertisement_duplicates_suppressed(hass):
+    """Copies of one advertisement from other proxies only improve the RSSI."""
+    from homeassistant.components.bluetooth import BluetoothChange
+
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    listener = MagicMock(spec=[])
+    device.register_listener(listener)
+
+    def advertisement(source, rssi, payload=b"\x01\x03"):
+        return MagicMock(
+            source=source,
+            rssi=rssi,
+            manufacturer_data={0xFFFF: payload},
+            service_data={},
+        )
+
+    device.handle_advertisement(
+        advertisement("proxy-a", -80), BluetoothChange.ADVERTISEMENT
+    )
+    device.handle_advertisement(
+        advertisement("proxy-b", -55), BluetoothChange.ADVERTISEMENT
+    )
+    device.handle_advertisement(
+        advertisement("proxy-c", -90), BluetoothChange.ADVERTISEMENT
+    )
+    assert listener.call_count == 1
+    assert device.advertisements.suppressed == 2
+    assert device.advertisements.best_source == "proxy-b"
+    assert device._rssi == -55
+
+    # A new payload (the die changed state) goes through
+    device.handle_advertisement(
+        advertisement("proxy-a", -70, b"\x05\x06"), BluetoothChange.ADVERTISEMENT
+    )
+    assert listener.call_count == 2
+    assert device._rssi == -70
+
+
+# IAmADie from a d20: 20 LEDs, onyxBlack, built 2024-01-01
+I_AM_A_D20 = struct.pack(
+    "<BBBBIIHIBBBB", 0x02, 20, 1, 7, 0, 0x1234, 0, 1704067200, 5, 19, 80, 0
+)
+
+
+class SimulatedBleakClient:
+    """In-memory stand-in for BleakClient that can drop its link on demand."""
+
+    instances: list["SimulatedBleakClient"] = []
+
+    def __init__(self, device, disconnected_callback=None):
+        self.device = device
+        self.disconnected_callback = disconnected_callback
+        self.is_connected = False
+        self.notify_callback = None
+        self.written: list[bytes] = []
+        SimulatedBleakClient.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+        return True
+
+    async def start_notify(self, char, callback):
+        self.notify_callback = callback
+
+    async def write_gatt_char(self, char, data, response=None):
+        self.written.append(bytes(data))
+        if data[0] == 0x01:  # WhoAreYou: answer as a d20
+            asyncio.get_running_loop().call_soon(
+                self.notify_callback, 0, bytearray(I_AM_A_D20)
+            )
+
+    def drop(self):
+        """Simulate the die going out of range."""
+        self.is_connected = False
+        self.disconnected_callback(self)
+
+
+@pytest.mark.asyncio
+async def test_unexpected_disconnect_is_detected_and_resumed(hass: HomeAssistant):
+    """A dropped link updates state immediately and autoconnect resumes it."""
+    import time
+
+    SimulatedBleakClient.instances = []
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", True)
+    ble_device = MagicMock()
+    ble_device.name = "Test Die"
+
+    with patch("custom_components.pixels_dice.sensor.BleakClient", SimulatedBleakClient), patch(
+        "custom_components.pixels_dice.sensor.bluetooth.async_get_scanner"
+    ) as mock_scanner:
+        await device.async_connect_die(ble_device)
+        first = SimulatedBleakClient.instances[0]
+        assert device._state == "Connected"
+
+        dropped_at = time.monotonic()
+        first.drop()
+        time_to_detect = time.monotonic() - dropped_at
+        assert device._state == "Disconnected"
+        assert device._client is None
+
+        # A late notification from the dead client is ignored
+        first.notify_callback(0, bytearray([0x03, 0x01, 0x05]))
+        assert device._face is None
+
+        await device._connect_task
+        time_to_resume = time.monotonic() - dropped_at
+
+    assert device._state == "Connected"
+    assert SimulatedBleakClient.instances[1].device is ble_device
+    mock_scanner.assert_not_called()
+    assert device.disconnect_count == 1
+    assert device.last_resume_ms is not None
+    assert time_to_detect < 0.05
+    assert time_to_resume < 0.5
+
+
+@pytest.mark.asyncio
+async def test_requested_disconnect_does_not_resume(hass: HomeAssistant):
+    """Disconnecting on purpose does not count as a drop or trigger a resume."""
+    SimulatedBleakClient.instances = []
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", True)
+
+    with patch("custom_components.pixels_dice.sensor.BleakClient", SimulatedBleakClient):
+        await device.async_connect_die(MagicMock())
+        client = SimulatedBleakClient.instances[0]
+        client.stop_notify = AsyncMock()
+        client.disconnect = AsyncMock(side_effect=lambda: client.drop())
+        await device.async_disconnect_die()
+
+    assert device._state == "Disconnected"
+    assert device.disconnect_count == 0
+    assert device._connect_task is None
+
+
+@pytest.mark.asyncio
+async def test_wait_for_roll_resolves_all_waiters(hass: HomeAssistant):
+    """Every pending waiter gets the next landing; cancelled ones are dropped."""
+    hass.loop = asyncio.get_running_loop()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+    waiters = [device.async_wait_for_roll() for _ in range(500)]
+    abandoned = device.async_wait_for_roll()
+    abandoned.cancel()
+
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))
+    assert not any(waiter.done() for waiter in waiters)
+    device._handle_roll(0, bytearray([0x03, 0x01, 0x03]))
+
+    results = await asyncio.gather(*waiters)
+    assert all(result is results[0] for result in results)
+    assert results[0]["die"] == "Test Die"
+    assert results[0]["face"] == 4
+    assert results[0]["settle_ms"] is not None
+    await asyncio.sleep(0)
+    assert not device._roll_waiters
+
+
+@pytest.mark.asyncio
+async def test_identity_handshake_is_cached(hass: HomeAssistant):
+    """The first connection identifies the die; the stored identity skips it later."""
+    from custom_components.pixels_dice.const import CONF_IDENTITY
+    from custom_components.pixels_dice.identity import DieIdentity
+    from custom_components.pixels_dice.sensor import PixelsDiceFaceSensor
+
+    entry = MagicMock(domain=DOMAIN, unique_id="test_die_unique_id", data={"name": "Test Die"})
+    await hass.config_entries.async_add(entry)
+    SimulatedBleakClient.instances = []
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+
+    with patch("custom_components.pixels_dice.sensor.BleakClient", SimulatedBleakClient):
+        await device.async_connect_die(MagicMock())
+
+    assert SimulatedBleakClient.instances[0].written[0] == bytes([0x01])
+    assert device.identity.die_type_name == "d20"
+    assert device.identity.led_count == 20
+    assert device.identity.face_range == (1, 20)
+    assert device.device_info["model"] == "Pixels d20 (onyxBlack)"
+    assert device.device_info["sw_version"] == "2024-01-01 00:00"
+    assert entry.data[CONF_IDENTITY] == device.identity.as_dict()
+    hass.data[dr.DATA_REGISTRY].async_update_device.assert_called_once()
+
+    # Face indexes outside the die are rejected
+    device._handle_roll(0, bytearray([0x03, 0x01, 25]))
+    assert device._face is None
+    device._handle_roll(0, bytearray([0x03, 0x01, 19]))
+    assert device._face == 20
+    assert PixelsDiceFaceSensor(device).extra_state_attributes == {
+        "die_type": "d20",
+        "min_face": 1,
+        "max_face": 20,
+    }
+
+    restored = PixelsDiceDevice(
+        hass,
+        "Test Die",
+        "test_die_unique_id",
+        False,
+        DieIdentity.from_dict(entry.data[CONF_IDENTITY]),
+    )
+    with patch("custom_components.pixels_dice.sensor.BleakClient", SimulatedBleakClient):
+        await restored.async_connect_die(MagicMock())
+    assert bytes([0x01]) not in SimulatedBleakClient.instances[1].written
+    assert restored.identity == device.identity
+
+
+@pytest.mark.asyncio
+async def test_shutdown_disconnects_dice_concurrently(hass: HomeAssistant):
+    """Dice disconnect in parallel; a hung die is abandoned at the deadline."""
+    from custom_components.pixels_dice.sensor import async_shutdown_dice
+
+    SimulatedBleakClient.instances = []
+    devices = [
+        PixelsDiceDevice(hass, f"Die {index}", f"die_{index}", True) for index in range(40)
+    ]
+    disconnecting = 0
+    all_disconnecting = asyncio.Event()
+    abandoned = asyncio.Event()
+
+    async def overlapping_disconnect():
+        # Only returns once every other die is disconnecting at the same time
+        nonlocal disconnecting
+        disconnecting += 1
+        if disconnecting == len(devices) - 1:
+            all_disconnecting.set()
+        await all_disconnecting.wait()
+
+    async def hung(*args):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            abandoned.set()
+            raise
+
+    with patch("custom_components.pixels_dice.sensor.BleakClient", SimulatedBleakClient):
+        for device in devices:
+            await device.async_connect_die(MagicMock())
+    for client in SimulatedBleakClient.instances:
+        client.stop_notify = AsyncMock()
+        client.disconnect = AsyncMock(side_effect=overlapping_disconnect)
+    SimulatedBleakClient.instances[0].disconnect = AsyncMock(side_effect=hung)
+    for device in devices:
+        device.statistics.async_stop = AsyncMock()
+    # A die whose statistics never get written is abandoned at the deadline too
+    devices[1].statistics.async_stop = AsyncMock(side_effect=hung)
+
+    await async_shutdown_dice(devices, timeout=0.2)
+
+    assert all_disconnecting.is_set()
+    # Stragglers are cancelled, not awaited
+    await asyncio.wait_for(abandoned.wait(), 1)
+    assert all(device._state == "Disconnected" for device in devices[1:])
+    assert all(device._client is None for device in devices)
+    for device in devices:
+        device.statistics.async_stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_removal_cancels_connect_in_progress(hass: HomeAssistant):
+    """Removing a die cancels its pending connect and blocks reconnects."""
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", True)
+    connecting = asyncio.Event()
+
+    async def hanging_connect(ble_device=None):
+        connecting.set()
+        await asyncio.sleep(60)
+
+    with patch.object(device, "async_connect_die", side_effect=hanging_connect):
+        device._async_schedule_connect(MagicMock())
+        task = device._connect_task
+        await connecting.wait()
+        await device.async_will_remove_from_hass()
+
+        assert task.cancelled()
+        assert device._connect_task is None
+        device._async_schedule_connect(MagicMock())
+        assert device._connect_task is None
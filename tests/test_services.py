@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.pixels_dice.const import DOMAIN
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+from custom_components.pixels_dice.services import (
+    SERVICE_WAIT_FOR_ROLL,
+    async_setup_services,
+)
+
+
+def _service_handler(hass, service):
+    """Return the handler registered for ``service``."""
+    hass.services = MagicMock()
+    async_setup_services(hass)
+    for call in hass.services.async_register.call_args_list:
+        if call.args[:2] == (DOMAIN, service):
+            return call.args[2]
+    raise AssertionError(f"{service} was not registered")
+
+
+def _land(device, face_index):
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))
+    device._handle_roll(0, bytearray([0x03, 0x01, face_index]))
+
+
+@pytest.fixture
+async def dice(hass):
+    hass.loop = asyncio.get_running_loop()
+    dice = [PixelsDiceDevice(hass, f"Die {i}", f"die_{i}", False) for i in range(2)]
+    with patch(
+        "custom_components.pixels_dice.services.async_get_target_devices",
+        return_value=dice,
+    ):
+        yield dice
+
+
+@pytest.mark.asyncio
+async def test_wait_for_roll_any_returns_first_landing(hass, dice):
+    """In ``any`` mode the first landing answers the call."""
+    wait_for_roll = _service_handler(hass, SERVICE_WAIT_FOR_ROLL)
+    call = MagicMock(data={"timeout": 5, "mode": "any"})
+
+    response = asyncio.create_task(wait_for_roll(call))
+    await asyncio.sleep(0)
+    _land(dice[1], 11)
+    result = await response
+
+    assert [(roll["die"], roll["unique_id"], roll["face"]) for roll in result["rolls"]] == [
+        ("Die 1", "die_1", 12)
+    ]
+    assert result["total"] == 12
+    assert result["timed_out"] is False
+    assert not dice[0]._roll_waiters
+
+
+@pytest.mark.asyncio
+async def test_wait_for_roll_timeout_returns_dice_that_landed(hass, dice):
+    """When the timeout expires the dice that landed are returned."""
+    wait_for_roll = _service_handler(hass, SERVICE_WAIT_FOR_ROLL)
+    call = MagicMock(data={"timeout": 0.05, "mode": "all"})
+
+    response = asyncio.create_task(wait_for_roll(call))
+    await asyncio.sleep(0)
+    _land(dice[0], 3)
+    result = await response
+
+    assert [roll["unique_id"] for roll in result["rolls"]] == ["die_0"]
+    assert result["total"] == 4
+    assert result["timed_out"] is True
+    assert not dice[1]._roll_waiters
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+
+
+def _stats_by_id(mock_add):
+    return {call.args[1]["statistic_id"]: call.args[2] for call in mock_add.call_args_list}
+
+
+@pytest.mark.asyncio
+async def test_landings_are_imported_as_hourly_statistics(hass):
+    """Landings are counted per hour and imported in one batch per statistic."""
+    device = PixelsDiceDevice(hass, "Test Die", "Test Die", False)
+    statistics = device.statistics
+    recorder = MagicMock()
+    recorder.async_add_executor_job = AsyncMock(return_value={})
+    hour = datetime(2025, 5, 1, 10, tzinfo=timezone.utc)
+
+    with patch(
+        "custom_components.pixels_dice.statistics.dt_util.utcnow",
+        return_value=hour.replace(minute=15),
+    ):
+        for face in (19, 19, 5):
+            statistics._handle_roll(device, 0x01, face)
+        statistics._handle_roll(device, 0x03, None)
+
+    with patch(
+        "custom_components.pixels_dice.statistics.get_instance", return_value=recorder
+    ), patch(
+        "custom_components.pixels_dice.statistics.async_add_external_statistics"
+    ) as mock_add, patch(
+        "custom_components.pixels_dice.statistics.dt_util.utcnow",
+        return_value=hour.replace(hour=11, minute=1),
+    ):
+        await statistics.async_flush()
+
+    stats = _stats_by_id(mock_add)
+    assert stats["pixels_dice:test_die_rolls"] == [{"start": hour, "state": 3, "sum": 3}]
+    assert stats["pixels_dice:test_die_face_19"] == [{"start": hour, "state": 2, "sum": 2}]
+    assert stats["pixels_dice:test_die_face_5"] == [{"start": hour, "state": 1, "sum": 1}]
+    # The closed hour is no longer held in memory
+    assert statistics._hours == {}
+
+
+@pytest.mark.asyncio
+async def test_sums_continue_from_recorder(hass):
+    """The first import continues the sum already stored by the recorder."""
+    device = PixelsDiceDevice(hass, "Test Die", "Test Die", False)
+    statistics = device.statistics
+    hour = datetime(2025, 5, 1, 10, tzinfo=timezone.utc)
+    recorder = MagicMock()
+    recorder.async_add_executor_job = AsyncMock(
+        side_effect=lambda func, hass, count, statistic_id, *args: {
+            statistic_id: [{"start": hour.timestamp() - 3600, "state": 4.0, "sum": 40.0}]
+        }
+    )
+
+    with patch(
+        "custom_components.pixels_dice.statistics.dt_util.utcnow",
+        return_value=hour.replace(minute=30),
+    ):
+        statistics._handle_roll(device, 0x01, 6)
+        with patch(
+            "custom_components.pixels_dice.statistics.get_instance", return_value=recorder
+        ), patch(
+            "custom_components.pixels_dice.statistics.async_add_external_statistics"
+        ) as mock_add:
+            await statistics.async_flush()
+
+    stats = _stats_by_id(mock_add)
+    assert stats["pixels_dice:test_die_rolls"] == [{"start": hour, "state": 1, "sum": 41.0}]
+    # The current hour is kept so it can be re-imported with later landings
+    assert hour in statistics._hours
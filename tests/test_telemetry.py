@@ -0,0 +1,118 @@
+import asyncio
+import struct
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.pixels_dice.const import EVENT_ROLL
+from custom_components.pixels_dice.sensor import (
+    REQUEST_TELEMETRY,
+    TELEMETRY_REQUEST_AUTOMATIC,
+    TELEMETRY_REQUEST_OFF,
+    PixelsDiceDevice,
+    PixelsDiceMotionSensor,
+)
+from custom_components.pixels_dice.telemetry import MotionTelemetry
+
+
+def telemetry_message(x: int, y: int, z: int) -> bytes:
+    """Return a telemetry message for an acceleration in thousandths of g."""
+    return struct.pack("<Bhhh", 0x04, x, y, z)
+
+
+def test_windows_are_downsampled():
+    """Every window of samples is reduced to its min, max and RMS magnitude."""
+    telemetry = MotionTelemetry(capacity=16, window_size=4, window_capacity=2)
+    telemetry.start_roll()
+    for value in (1000, 3000, 0, 4000, 2000, 2000, 2000, 2000):
+        telemetry.add(telemetry_message(0, 0, value))
+
+    assert telemetry.windows() == [(0.0, 4.0, 2.55), (2.0, 2.0, 2.0)]
+    assert telemetry.finish_roll() == {
+        "samples": 8,
+        "min_g": 0.0,
+        "max_g": 4.0,
+        "rms_g": 2.291,
+    }
+
+
+def test_memory_is_bounded():
+    """A long session keeps only fixed-size buffers."""
+    telemetry = MotionTelemetry(capacity=16, window_size=4, window_capacity=3)
+    buffers = (telemetry._samples, telemetry._win_min, telemetry._win_max)
+    sizes = [len(buffer) for buffer in buffers]
+    for roll in range(50):
+        telemetry.start_roll()
+        for _ in range(100):
+            telemetry.add(telemetry_message(600, 800, roll))
+        telemetry.finish_roll()
+
+    assert [len(buffer) for buffer in buffers] == sizes
+    assert len(telemetry.windows()) == 3
+    assert telemetry.last_roll["samples"] == 100
+    assert telemetry.last_roll["max_g"] == pytest.approx(1.0, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_telemetry_streams_only_during_rolls(hass):
+    """Telemetry is switched on by the roll and summarized when it lands."""
+    hass.loop = asyncio.get_running_loop()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False, telemetry=True)
+    device.async_send_command = AsyncMock()
+
+    device._handle_roll(0, bytearray([0x03, 0x02, 0x00]))  # handling
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))  # rolling
+    for z in (1000, 2500, 500):
+        device._handle_roll(0, bytearray(telemetry_message(0, 0, z)))
+    device._handle_roll(0, bytearray([0x03, 0x01, 0x04]))  # landed on 5
+    await device._telemetry_task
+
+    modes = [call.args[0][1] for call in device.async_send_command.call_args_list]
+    assert [call.args[0][0] for call in device.async_send_command.call_args_list] == [
+        REQUEST_TELEMETRY,
+        REQUEST_TELEMETRY,
+    ]
+    assert modes == [TELEMETRY_REQUEST_AUTOMATIC, TELEMETRY_REQUEST_OFF]
+
+    event_type, data = hass.bus.async_fire.call_args.args
+    assert event_type == EVENT_ROLL
+    assert data["motion"] == {"samples": 3, "min_g": 0.5, "max_g": 2.5, "rms_g": 1.581}
+
+    sensor = PixelsDiceMotionSensor(device)
+    assert sensor.native_value == 2.5
+    assert sensor.extra_state_attributes == {"min_g": 0.5, "rms_g": 1.581, "samples": 3}
+
+
+def test_telemetry_is_opt_in(hass):
+    """Without the option, telemetry messages are ignored and nothing is requested."""
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False)
+
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))
+    device._handle_roll(0, bytearray(telemetry_message(0, 0, 1000)))
+
+    assert device.telemetry is None
+    assert device._telemetry_task is None
+
+
+@pytest.mark.asyncio
+async def test_telemetry_is_requested_again_after_reconnect(hass):
+    """A link dropped mid-roll does not leave the stream marked as running."""
+    hass.loop = asyncio.get_running_loop()
+    device = PixelsDiceDevice(hass, "Test Die", "test_die_unique_id", False, telemetry=True)
+    device.async_send_command = AsyncMock()
+    device._client = client = MagicMock(is_connected=True)
+
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))  # rolling
+    device._handle_roll(0, bytearray(telemetry_message(0, 0, 1000)))
+    await device._telemetry_task
+    device._handle_disconnect(client)
+    assert not device.telemetry.active
+
+    # Reconnected: the next roll switches the stream on again
+    device._client = MagicMock(is_connected=True)
+    device._handle_roll(0, bytearray([0x03, 0x03, 0x00]))
+    await device._telemetry_task
+
+    modes = [call.args[0][1] for call in device.async_send_command.call_args_list]
+    assert modes == [TELEMETRY_REQUEST_AUTOMATIC, TELEMETRY_REQUEST_AUTOMATIC]
+    assert device.telemetry.active
@@ -0,0 +1,145 @@
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.pixels_dice.const import DOMAIN
+from custom_components.pixels_dice.sensor import PixelsDiceDevice
+from custom_components.pixels_dice.websocket_api import ws_subscribe_rolls
+
+
+def _connection():
+    connection = MagicMock()
+    connection.subscriptions = {}
+    return connection
+
+
+def _sent_events(connection):
+    return [json.loads(call.args[0])["event"] for call in connection.send_message.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_rolls_streams_filtered_rolls(hass):
+    """Rolls are streamed from the notification handler for the selected dice."""
+    hass.loop = asyncio.get_running_loop()
+    die_a = PixelsDiceDevice(hass, "Die A", "Die A", False)
+    die_b = PixelsDiceDevice(hass, "Die B", "Die B", False)
+    hass.data[DOMAIN] = {"Die A": die_a, "Die B": die_b}
+    connection = _connection()
+
+    ws_subscribe_rolls(
+        hass, connection, {"id": 5, "type": "pixels_dice/subscribe_rolls", "dice": ["Die A"], "buffer_size": 8}
+    )
+    connection.send_result.assert_called_once_with(5)
+
+    die_a._handle_roll(0, bytearray([0x03, 0x03, 0x00]))
+    die_a._handle_roll(0, bytearray([0x03, 0x01, 0x13]))
+    die_b._handle_roll(0, bytearray([0x03, 0x01, 0x05]))
+    await asyncio.sleep(0)
+
+    events = _sent_events(connection)
+    assert len(events) == 1
+    rolls = events[0]["rolls"]
+    assert [(r["die"], r["state"], r["face"]) for r in rolls] == [
+        ("Die A", "rolling", None),
+        ("Die A", "rolled", 20),
+    ]
+
+    connection.subscriptions[5]()
+    die_a._handle_roll(0, bytearray([0x03, 0x01, 0x00]))
+    await asyncio.sleep(0)
+    assert connection.send_message.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_subscribe_rolls_bounds_buffer(hass):
+    """A burst larger than the buffer drops the oldest rolls and reports it."""
+    hass.loop = asyncio.get_running_loop()
+    die = PixelsDiceDevice(hass, "Die A", "Die A", False)
+    hass.data[DOMAIN] = {"Die A": die}
+    connection = _connection()
+
+    ws_subscribe_rolls(hass, connection, {"id": 1, "type": "pixels_dice/subscribe_rolls", "buffer_size": 2})
+    for face in range(5):
+        die._handle_roll(0, bytearray([0x03, 0x01, face]))
+    await asyncio.sleep(0)
+
+    (event,) = _sent_events(connection)
+    assert [r["face"] for r in event["rolls"]] == [4, 5]
+    assert event["dropped"] == 3
+
+
+@pytest.mark.asyncio
+async def test_subscribe_rolls_paces_a_connection_that_does_not_drain(hass):
+    """Rolls spread over many loop iterations still make one message per interval."""
+    hass.loop = asyncio.get_running_loop()
+    die = PixelsDiceDevice(hass, "Die A", "Die A", False)
+    hass.data[DOMAIN] = {"Die A": die}
+    # The client never reads, so every message sent stays outstanding
+    connection = _connection()
+
+    with patch("custom_components.pixels_dice.websocket_api.FLUSH_INTERVAL", 0.05):
+        ws_subscribe_rolls(hass, connection, {"id": 4, "type": "pixels_dice/subscribe_rolls", "buffer_size": 2})
+        die._handle_roll(0, bytearray([0x03, 0x01, 0x00]))
+        await asyncio.sleep(0)
+        assert connection.send_message.call_count == 1
+
+        for face in range(1, 6):
+            die._handle_roll(0, bytearray([0x03, 0x01, face]))
+            await asyncio.sleep(0)
+        assert connection.send_message.call_count == 1
+
+        await asyncio.sleep(0.06)
+    assert connection.send_message.call_count == 2
+    event = _sent_events(connection)[1]
+    assert [r["face"] for r in event["rolls"]] == [5, 6]
+    assert event["dropped"] == 3
+
+    connection.subscriptions[4]()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_rolls_follows_dice_added_later(hass):
+    """Dice set up after subscribing are streamed if they match the group."""
+    hass.loop = asyncio.get_running_loop()
+    hass.data[DOMAIN] = {}
+    areas = {"Die A": "table", "Die B": "kitchen"}
+    hass.data[dr.DATA_REGISTRY].async_get_device.side_effect = (
+        lambda identifiers: MagicMock(area_id=areas[next(iter(identifiers))[1]])
+    )
+    connection = _connection()
+    ws_subscribe_rolls(
+        hass, connection, {"id": 2, "type": "pixels_dice/subscribe_rolls", "group": "table", "buffer_size": 8}
+    )
+
+    dice = {}
+    for name in areas:
+        dice[name] = hass.data[DOMAIN][name] = PixelsDiceDevice(hass, name, name, False)
+        with patch("custom_components.pixels_dice.sensor.bluetooth"):
+            await dice[name].async_added_to_hass()
+    dice["Die A"]._handle_roll(0, bytearray([0x03, 0x01, 0x02]))
+    dice["Die B"]._handle_roll(0, bytearray([0x03, 0x01, 0x05]))
+    await asyncio.sleep(0)
+
+    (event,) = _sent_events(connection)
+    assert [(r["die"], r["face"]) for r in event["rolls"]] == [("Die A", 3)]
+
+
+@pytest.mark.asyncio
+async def test_failing_roll_listener_does_not_break_roll_handling(hass):
+    """An exception in one subscriber reaches neither the die nor other subscribers."""
+    hass.loop = asyncio.get_running_loop()
+    die = PixelsDiceDevice(hass, "Die A", "Die A", False)
+    hass.data[DOMAIN] = {"Die A": die}
+    die.register_roll_listener(MagicMock(side_effect=RuntimeError("boom")))
+    connection = _connection()
+    ws_subscribe_rolls(hass, connection, {"id": 3, "type": "pixels_dice/subscribe_rolls", "buffer_size": 8})
+
+    die._handle_roll(0, bytearray([0x03, 0x01, 0x05]))
+    await asyncio.sleep(0)
+
+    assert die._face == 6
+    (event,) = _sent_events(connection)
+    assert event["rolls"][0]["face"] == 6